@@ -0,0 +1,180 @@
+import os
+import sys
+import json
+import math
+import random
+import argparse
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+
+from events import FLOORS, TICKS_PER_SECOND, Request, format_request, parse_request
+from gen import ELEVATOR_IDS, generate_requests
+from online import add_command_argument, program_command
+from stress import run_requests
+
+OBJECTIVES = ["Trun", "WT", "W", "violation"]
+TENTH = TICKS_PER_SECOND // 10  # Input timestamps have one decimal
+
+
+def to_lines(requests):
+    """Formats requests in timestamp order with passenger IDs renumbered from 1."""
+    ordered = sorted(requests, key=lambda r: r.timestamp)
+    return [format_request(Request(r.timestamp, i, r.priority, r.from_floor, r.to_floor, r.elevator_id))
+            for i, r in enumerate(ordered, start=1)]
+
+
+def fitness(result, objective):
+    """Higher is worse for the program; any judge violation beats every score."""
+    if result["verdict"] != "Accepted":
+        return math.inf
+    if objective == "violation":
+        return result["Trun"]  # No violation yet: prefer inputs that keep the scheduler busy longest
+    return result[objective]
+
+
+def evaluate(requests, command, objective, timeout, idle_timeout):
+    result = run_requests(to_lines(requests), command, timeout, idle_timeout, name="adversary")
+    return fitness(result, objective), result
+
+
+class Mutator:
+    """Random edits of a request list within the input limits."""
+
+    def __init__(self, rng, time_limit, max_requests):
+        self.rng = rng
+        self.max_ticks = time_limit * TICKS_PER_SECOND
+        self.max_requests = max_requests
+
+    def random_timestamp(self):
+        return self.rng.randrange(TICKS_PER_SECOND, self.max_ticks + 1, TENTH)
+
+    def random_floors(self):
+        from_floor, to_floor = self.rng.sample(range(len(FLOORS)), 2)
+        return from_floor, to_floor
+
+    def random_request(self):
+        from_floor, to_floor = self.random_floors()
+        return Request(self.random_timestamp(), 0, self.rng.randint(1, 100), from_floor, to_floor,
+                       self.rng.choice(ELEVATOR_IDS))
+
+    def mutate(self, requests):
+        requests = list(requests)
+        i = self.rng.randrange(len(requests))
+        r = requests[i]
+        op = self.rng.randrange(6)
+        if op == 0 and len(requests) < self.max_requests:
+            requests.append(self.random_request())
+        elif op == 1 and len(requests) > 1:
+            del requests[i]
+        elif op == 2:
+            from_floor, to_floor = self.random_floors()
+            requests[i] = Request(r.timestamp, 0, r.priority, from_floor, to_floor, r.elevator_id)
+        elif op == 3:
+            requests[i] = Request(r.timestamp, 0, r.priority, r.from_floor, r.to_floor, self.rng.choice(ELEVATOR_IDS))
+        elif op == 4:
+            shift = self.rng.randint(-50, 50) * TENTH
+            timestamp = min(max(r.timestamp + shift, TICKS_PER_SECOND), self.max_ticks)
+            requests[i] = Request(timestamp, 0, r.priority, r.from_floor, r.to_floor, r.elevator_id)
+        elif len(requests) < self.max_requests:
+            # Copy a request to another one's timestamp to build up bursts
+            other = self.rng.choice(requests)
+            requests.append(Request(other.timestamp, 0, r.priority, r.from_floor, r.to_floor, r.elevator_id))
+        return requests
+
+    def crossover(self, a, b):
+        """Requests of a before a random cut time, requests of b after it."""
+        cut = self.random_timestamp()
+        child = [r for r in a if r.timestamp < cut] + [r for r in b if r.timestamp >= cut]
+        return child[:self.max_requests] or list(a)
+
+
+def search(executor, evaluator, mutator, initial, generations, population, offspring, log=print):
+    """(mu + lambda) evolutionary search; returns [(fitness, result, requests)] sorted worst-first."""
+    scored = [(f, res, reqs) for (f, res), reqs in zip(executor.map(evaluator, initial), initial)]
+    scored.sort(key=lambda c: c[0], reverse=True)
+    scored = scored[:population]
+    for generation in range(1, generations + 1):
+        if scored[0][0] == math.inf:
+            break
+        children = []
+        for _ in range(offspring):
+            parent = mutator.rng.choice(scored)[2]
+            if len(scored) > 1 and mutator.rng.random() < 0.3:
+                parent = mutator.crossover(parent, mutator.rng.choice(scored)[2])
+            children.append(mutator.mutate(parent))
+        scored.extend((f, res, reqs) for (f, res), reqs in zip(executor.map(evaluator, children), children))
+        scored.sort(key=lambda c: c[0], reverse=True)
+        scored = scored[:population]
+        log(f"generation {generation}: best {scored[0][0]:.4f} ({scored[0][1]['verdict']}, {len(scored[0][2])} requests)")
+    return scored
+
+
+def minimize(executor, evaluator, requests, target):
+    """Drops chunks of requests while the fitness stays at or above target (ddmin style)."""
+    chunk = len(requests) // 2
+    while chunk >= 1 and len(requests) > 1:
+        candidates = [requests[:i] + requests[i + chunk:] for i in range(0, len(requests), chunk)]
+        candidates = [c for c in candidates if c]
+        for (f, _), candidate in zip(executor.map(evaluator, candidates), candidates):
+            if f >= target:
+                requests = candidate
+                break
+        else:
+            chunk //= 2
+            continue
+        chunk = min(chunk, len(requests) // 2)
+    return requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search for inputs that degrade or break an elevator program.")
+    parser.add_argument("--objective", choices=OBJECTIVES, default="WT", help="Metric to maximize, or violation to hunt for judge errors.")
+    parser.add_argument("--generations", type=int, default=20, help="Number of search generations.")
+    parser.add_argument("--population", type=int, default=8, help="Candidates kept between generations.")
+    parser.add_argument("--offspring", type=int, default=16, help="Mutated candidates evaluated per generation.")
+    parser.add_argument("--num_requests", type=int, default=50, help="Requests per initial input.")
+    parser.add_argument("--max_requests", type=int, default=100, help="Upper bound on requests per input.")
+    parser.add_argument("--time_limit", type=int, default=50, help="Limit of input time.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the search.")
+    parser.add_argument("--tolerance", type=float, default=0.05, help="Relative metric loss allowed while minimizing.")
+    parser.add_argument("--keep", type=int, default=3, help="Number of worst inputs to write.")
+    parser.add_argument("--out_dir", default="adversarial", help="Directory to write the worst inputs to.")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Wall-clock limit per run in seconds.")
+    parser.add_argument("--idle_timeout", type=float, default=10.0, help="Idle limit per run in seconds.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: CPU count).")
+    add_command_argument(parser)
+
+    args = parser.parse_args()
+    command = program_command(parser, args)
+
+    rng = random.Random(args.seed)
+    mutator = Mutator(rng, args.time_limit, args.max_requests)
+    evaluator = partial(evaluate, command=command, objective=args.objective,
+                        timeout=args.timeout, idle_timeout=args.idle_timeout)
+    initial = [[parse_request(line) for line in generate_requests(args.num_requests, args.time_limit, rng.randrange(2 ** 32))]
+               for _ in range(args.population)]
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    summary = []
+    with ProcessPoolExecutor(max_workers=args.workers or os.cpu_count() or 1) as executor:
+        scored = search(executor, evaluator, mutator, initial, args.generations, args.population, args.offspring)
+        for rank, (f, result, requests) in enumerate(scored[:args.keep], start=1):
+            target = f if f == math.inf else f * (1 - args.tolerance)
+            minimal = minimize(executor, evaluator, requests, target)
+            f, result = evaluator(minimal)
+            path = os.path.join(args.out_dir, f"worst_{rank}.txt")
+            with open(path, "w") as out:
+                out.write("\n".join(to_lines(minimal)) + "\n")
+            summary.append({"input": path, "fitness": None if f == math.inf else f, "requests": len(minimal), **result})
+            metric = "Trun" if args.objective == "violation" else args.objective
+            score = "violation" if f == math.inf else f"{metric}={f:.4f}"
+            print(f"{path}: {result['verdict']} {score} with {len(minimal)} requests {result['error']}")
+
+    with open(os.path.join(args.out_dir, "summary.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+    if any(s["verdict"] != "Accepted" for s in summary):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import os
+import csv
+import argparse
+
+from events import TICKS_PER_SECOND, FLOORS, EVENT_NAMES, ARRIVE, OPEN, CLOSE, IN, OUT, read_events, read_requests
+from ruleset import DEFAULT_RULES
+from stats import summarize
+
+ELEVATOR_FIELDS = ["elevator_id", "events", "arrives", "empty_arrives", "opens", "wasted_cycles",
+                   "moving_s", "door_open_s", "idle_s", "utilization", "mean_load", "max_load", "served"]
+PASSENGER_FIELDS = ["passenger_id", "priority", "elevator_id", "request_s", "first_in_s", "out_s",
+                    "wait_s", "ride_s", "total_s"]
+TIMELINE_FIELDS = ["elevator_id", "time_s", "event", "floor", "load", "passenger_id"]
+
+
+class ElevatorTimeline:
+    """Running totals of one elevator, all times in ticks."""
+    __slots__ = ("events", "arrives", "empty_arrives", "opens", "wasted_cycles", "moving", "door_open",
+                 "load", "max_load", "load_area", "served", "last_timestamp", "open_timestamp", "transfers")
+
+    def __init__(self):
+        self.events = 0
+        self.arrives = 0
+        self.empty_arrives = 0
+        self.opens = 0
+        self.wasted_cycles = 0
+        self.moving = 0
+        self.door_open = 0
+        self.load = 0
+        self.max_load = 0
+        self.load_area = 0  # Integral of the load over time
+        self.served = 0
+        self.last_timestamp = 0
+        self.open_timestamp = None
+        self.transfers = 0  # IN/OUT since the door opened
+
+
+def to_seconds(ticks):
+    return round(ticks / TICKS_PER_SECOND, 4)
+
+
+def analyze(requests, events, timeline=None):
+    """
+    Derives per-elevator and per-passenger figures from parsed requests and
+    output events in one pass. Moving time counts the elevator's ticks per
+    floor under DEFAULT_RULES per ARRIVE (or the gap since its previous
+    event, if shorter); idle time is the rest of the run. Every event is
+    also passed to timeline.writerow() with the elevator's load after it,
+    if a timeline writer is given.
+    Returns (elevator rows, passenger rows) keyed like the *_FIELDS lists.
+    """
+    move_ticks = DEFAULT_RULES.move_ticks
+    passenger_requests = {request.passenger_id: request for request in requests}
+    elevators = {}
+    first_in = {}
+    boarded = {}  # passenger -> timestamp of the IN of the current leg
+    ride = {}
+    out_time = {}
+    final_timestamp = 0
+
+    for event in events:
+        state = elevators.get(event.elevator_id)
+        if state is None:
+            state = elevators[event.elevator_id] = ElevatorTimeline()
+        timestamp = event.timestamp
+        final_timestamp = max(final_timestamp, timestamp)
+        state.load_area += state.load * (timestamp - state.last_timestamp)
+        state.events += 1
+
+        if event.type == ARRIVE:
+            state.arrives += 1
+            state.moving += min(move_ticks.get(event.elevator_id, 0), timestamp - state.last_timestamp)
+            if state.load == 0:
+                state.empty_arrives += 1
+        elif event.type == OPEN:
+            state.opens += 1
+            state.open_timestamp = timestamp
+            state.transfers = 0
+        elif event.type == CLOSE:
+            if state.open_timestamp is not None:
+                state.door_open += timestamp - state.open_timestamp
+                state.open_timestamp = None
+            if state.transfers == 0:
+                state.wasted_cycles += 1
+        elif event.type == IN:
+            state.transfers += 1
+            state.load += 1
+            state.max_load = max(state.max_load, state.load)
+            first_in.setdefault(event.passenger_id, timestamp)
+            boarded[event.passenger_id] = timestamp
+        elif event.type == OUT:
+            state.transfers += 1
+            state.load -= 1
+            state.served += 1
+            if event.passenger_id in boarded:
+                ride[event.passenger_id] = ride.get(event.passenger_id, 0) + timestamp - boarded.pop(event.passenger_id)
+            out_time[event.passenger_id] = timestamp
+        state.last_timestamp = timestamp
+
+        if timeline is not None:
+            timeline.writerow((event.elevator_id, to_seconds(timestamp), EVENT_NAMES[event.type], FLOORS[event.floor],
+                               state.load, event.passenger_id if event.passenger_id >= 0 else ""))
+
+    elevator_rows = []
+    for elevator_id in sorted(elevators):
+        state = elevators[elevator_id]
+        state.load_area += state.load * (final_timestamp - state.last_timestamp)
+        idle = final_timestamp - state.moving - state.door_open
+        elevator_rows.append({
+            "elevator_id": elevator_id, "events": state.events, "arrives": state.arrives,
+            "empty_arrives": state.empty_arrives, "opens": state.opens, "wasted_cycles": state.wasted_cycles,
+            "moving_s": to_seconds(state.moving), "door_open_s": to_seconds(state.door_open),
+            "idle_s": to_seconds(idle),
+            "utilization": round((state.moving + state.door_open) / final_timestamp, 4) if final_timestamp else 0.0,
+            "mean_load": round(state.load_area / final_timestamp, 4) if final_timestamp else 0.0,
+            "max_load": state.max_load, "served": state.served,
+        })
+
+    passenger_rows = []
+    for passenger_id, request in passenger_requests.items():
+        row = {"passenger_id": passenger_id, "priority": request.priority, "elevator_id": request.elevator_id,
+               "request_s": to_seconds(request.timestamp), "first_in_s": None, "out_s": None,
+               "wait_s": None, "ride_s": None, "total_s": None}
+        if passenger_id in out_time:
+            total = out_time[passenger_id] - request.timestamp
+            riding = ride.get(passenger_id, 0)
+            first_boarding = first_in.get(passenger_id)
+            row.update(first_in_s=None if first_boarding is None else to_seconds(first_boarding),
+                       out_s=to_seconds(out_time[passenger_id]),
+                       wait_s=to_seconds(total - riding), ride_s=to_seconds(riding), total_s=to_seconds(total))
+        passenger_rows.append(row)
+    return elevator_rows, passenger_rows
+
+
+def write_csv(path, fields, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-elevator utilization and per-passenger wait/ride analytics.")
+    parser.add_argument("--input_file", default="input.txt", help="Path to the input file (generated by gen.py).")
+    parser.add_argument("--output_file", default="output.txt", help="Path to the output file (from the elevator simulation).")
+    parser.add_argument("--out_dir", default=None, help="Optional directory for elevators.csv, passengers.csv and timeline.csv.")
+    args = parser.parse_args()
+
+    timeline_file = None
+    try:
+        timeline = None
+        if args.out_dir:
+            os.makedirs(args.out_dir, exist_ok=True)
+            timeline_file = open(os.path.join(args.out_dir, "timeline.csv"), "w", newline="")
+            timeline = csv.writer(timeline_file)
+            timeline.writerow(TIMELINE_FIELDS)
+        with open(args.input_file, "r") as f_in, open(args.output_file, "r") as f_out:
+            elevator_rows, passenger_rows = analyze(read_requests(f_in, skip_invalid=True),
+                                                    read_events(f_out, skip_invalid=True), timeline)
+    finally:
+        if timeline_file is not None:
+            timeline_file.close()
+
+    if args.out_dir:
+        write_csv(os.path.join(args.out_dir, "elevators.csv"), ELEVATOR_FIELDS, elevator_rows)
+        write_csv(os.path.join(args.out_dir, "passengers.csv"), PASSENGER_FIELDS, passenger_rows)
+
+    print(f"{'elev':>4} {'moving':>8} {'door':>8} {'idle':>8} {'util':>6} {'load':>6} {'max':>4} "
+          f"{'served':>6} {'empty':>6} {'wasted':>6}")
+    for row in elevator_rows:
+        print(f"{row['elevator_id']:>4} {row['moving_s']:>8.1f} {row['door_open_s']:>8.1f} {row['idle_s']:>8.1f} "
+              f"{row['utilization']:>6.2f} {row['mean_load']:>6.2f} {row['max_load']:>4} {row['served']:>6} "
+              f"{row['empty_arrives']:>6} {row['wasted_cycles']:>6}")
+    served = [row for row in passenger_rows if row["total_s"] is not None]
+    for key in ("wait_s", "ride_s", "total_s"):
+        s = summarize([row[key] for row in served])
+        print(f"{key[:-2]:>5}: mean {s['mean']:.4f}  p50 {s['p50']:.4f}  p95 {s['p95']:.4f}  max {s['max']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
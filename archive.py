@@ -0,0 +1,323 @@
+import os
+import sys
+import json
+import mmap
+import zlib
+import struct
+import argparse
+from array import array
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+
+from batch import find_cases, read_manifest, write_summary
+from events import Event, ParseError, Request, parse_event, parse_request
+from judge import ElevatorValidator, ValidationError
+from score import score_events
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Layout: MAGIC, then one compressed block per run section (requests,
+# events), then a JSON index, then a footer of the index offset and MAGIC.
+# Each block holds its section's columns back to back as packed arrays in
+# the byte order named in the index.
+MAGIC = b"ELVARC1\0"
+FOOTER = struct.Struct("<Q8s")
+CODECS = ["zlib", "zstd", "none"]
+
+# Floors and event types are small codes from the lexer; the numbers taken
+# from the text get 64 bits, and lines with larger ones count as invalid.
+REQUEST_COLUMNS = [("timestamp", "q"), ("passenger_id", "q"), ("priority", "q"),
+                   ("from_floor", "b"), ("to_floor", "b"), ("elevator_id", "q")]
+EVENT_COLUMNS = [("timestamp", "q"), ("type", "b"), ("floor", "b"), ("elevator_id", "q"), ("passenger_id", "q")]
+LIMITS = {code: (-2 ** (8 * array(code).itemsize - 1), 2 ** (8 * array(code).itemsize - 1) - 1) for code in "bq"}
+
+
+def compress(data, codec, level):
+    if codec == "zlib":
+        return zlib.compress(data, level)
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    return bytes(data)
+
+
+def decompress(data, codec):
+    if codec == "zlib":
+        return zlib.decompress(data)
+    if codec == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data)
+    return data
+
+
+def fits(record, columns):
+    for name, code in columns:
+        low, high = LIMITS[code]
+        if not low <= getattr(record, name) <= high:
+            return False
+    return True
+
+
+def parse_file(path, parse, columns, kind):
+    """
+    Parses every line of a trace file, as the judge and score.py read it.
+    Returns (records, error): the records of every valid line, and the first
+    error as (records before it, message) or None. Lines whose numbers don't
+    fit the columns are invalid as well.
+    """
+    records = []
+    error = None
+    try:
+        with open(path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = parse(line)
+                    if not fits(record, columns):
+                        raise ParseError(f"Invalid {kind} format: {line}")
+                    records.append(record)
+                except ParseError as e:
+                    if error is None:
+                        error = (len(records), str(e))
+    except FileNotFoundError as e:
+        error = (0, f"File not found: {e}")
+    return records, error
+
+
+class ArchiveWriter:
+    """Appends runs to a new archive file; the index is written on close()."""
+
+    def __init__(self, path, codec="zlib", level=6):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec: {codec}")
+        if codec == "zstd" and zstandard is None:
+            raise ValueError("The zstd codec needs the zstandard package")
+        self.codec = codec
+        self.level = level
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(MAGIC)
+        self.runs = []
+        self.names = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def abort(self):
+        """Drops the partial archive, so that no index of an incomplete pack is ever written."""
+        self.file.close()
+        os.remove(self.path)
+
+    def write_section(self, records, columns):
+        arrays = [array(code, (getattr(r, name) for r in records)) for name, code in columns]
+        raw = b"".join(a.tobytes() for a in arrays)
+        block = compress(raw, self.codec, self.level)
+        offset = self.file.tell()
+        self.file.write(block)
+        return {"offset": offset, "length": len(block), "count": len(records)}
+
+    def add_run(self, name, requests, events, input_error=None, output_error=None, meta=None):
+        """Stores one run; errors are (records before the bad line, message) as from parse_file()."""
+        if name in self.names:
+            raise ValueError(f"Duplicate run name: {name}")
+        self.names.add(name)
+        self.runs.append({
+            "name": name,
+            "requests": self.write_section(requests, REQUEST_COLUMNS),
+            "events": self.write_section(events, EVENT_COLUMNS),
+            "input_error": input_error,
+            "output_error": output_error,
+            "meta": meta or {},
+        })
+
+    def add_files(self, name, input_file, output_file, meta=None):
+        requests, input_error = parse_file(input_file, parse_request, REQUEST_COLUMNS, "input")
+        events, output_error = parse_file(output_file, parse_event, EVENT_COLUMNS, "output")
+        self.add_run(name, requests, events, input_error, output_error, meta)
+
+    def close(self):
+        if self.file.closed:
+            return
+        offset = self.file.tell()
+        index = {"codec": self.codec, "byteorder": sys.byteorder, "runs": self.runs,
+                 "columns": {"requests": REQUEST_COLUMNS, "events": EVENT_COLUMNS}}
+        self.file.write(json.dumps(index).encode())
+        self.file.write(FOOTER.pack(offset, MAGIC))
+        self.file.close()
+
+
+class ArchiveReader:
+    """Memory-maps an archive; blocks are decompressed straight from the mapping."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.mm) < len(MAGIC) + FOOTER.size or self.mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a trace archive: {path}")
+        offset, magic = FOOTER.unpack_from(self.mm, len(self.mm) - FOOTER.size)
+        if magic != MAGIC:
+            raise ValueError(f"Truncated trace archive: {path}")
+        index = json.loads(self.mm[offset:len(self.mm) - FOOTER.size])
+        self.codec = index["codec"]
+        self.swap = index["byteorder"] != sys.byteorder
+        self.columns = index["columns"]
+        self.runs = {run["name"]: run for run in index["runs"]}
+
+    def close(self):
+        self.mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def names(self):
+        return list(self.runs)
+
+    def read_columns(self, name, section):
+        """{column: array} of one section ("requests" or "events") of a run."""
+        entry = self.runs[name][section]
+        raw = decompress(memoryview(self.mm)[entry["offset"]:entry["offset"] + entry["length"]], self.codec)
+        columns = {}
+        position = 0
+        for column, code in self.columns[section]:
+            values = array(code)
+            size = values.itemsize * entry["count"]
+            values.frombytes(raw[position:position + size])
+            if self.swap:
+                values.byteswap()
+            columns[column] = values
+            position += size
+        return columns
+
+    def requests(self, name):
+        c = self.read_columns(name, "requests")
+        return [Request(*fields) for fields in zip(c["timestamp"], c["passenger_id"], c["priority"],
+                                                   c["from_floor"], c["to_floor"], c["elevator_id"])]
+
+    def events(self, name):
+        c = self.read_columns(name, "events")
+        return map(Event, c["timestamp"], c["type"], c["floor"], c["elevator_id"], c["passenger_id"])
+
+
+def validate_run(reader, name, ruleset=None):
+    """ElevatorValidator.validate() over an archived run, raising ValidationError the same way."""
+    run = reader.runs[name]
+    if run["input_error"]:
+        raise ValidationError(run["input_error"][1])
+    validator = ElevatorValidator(None, None, ruleset)
+    for request in reader.requests(name):
+        validator.passenger_requests[request.passenger_id] = request
+    valid_events = run["output_error"][0] if run["output_error"] else run["events"]["count"]
+    for i, event in enumerate(reader.events(name)):
+        if i == valid_events:
+            break
+        validator.process(event)
+    if run["output_error"]:
+        raise ValidationError(run["output_error"][1])
+    validator.validate_final_state()
+
+
+@lru_cache(maxsize=None)
+def open_archive(path):
+    """One reader per archive and process, shared by the jobs of a pool worker."""
+    return ArchiveReader(path)
+
+
+def rescore_run(name, path, score_only=False):
+    """batch.judge_case() over an archived run; never raises."""
+    result = {"case": name, "verdict": "Scored" if score_only else "Accepted", "error": "",
+              "Trun": None, "WT": None, "W": None}
+    try:
+        reader = open_archive(path)
+        try:
+            if not score_only:
+                validate_run(reader, name)
+            result.update(score_events(reader.requests(name), reader.events(name)))
+        except ValidationError as e:
+            result["verdict"] = "Wrong Answer"
+            result["error"] = str(e)
+    except Exception as e:
+        result["verdict"] = "Judge Error"
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def rescore(path, workers=None, score_only=False):
+    with ArchiveReader(path) as reader:
+        names = reader.names()
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(names) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(rescore_run, names, [path] * len(names), [score_only] * len(names),
+                                 chunksize=chunksize))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack input/output pairs into a binary trace archive and re-judge or re-score it.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    pack = commands.add_parser("pack", help="Parse cases once and store them in an archive.")
+    source = pack.add_mutually_exclusive_group(required=True)
+    source.add_argument("--dir", help="Directory with one subdirectory (input.txt + output.txt) per case.")
+    source.add_argument("--manifest", help="File listing '<input_file> <output_file> [case]' per line.")
+    pack.add_argument("--archive", required=True, help="Archive file to write.")
+    pack.add_argument("--codec", choices=CODECS, default="zlib", help="Block compression (zstd needs zstandard).")
+    pack.add_argument("--level", type=int, default=6, help="Compression level.")
+
+    listing = commands.add_parser("list", help="List the runs of an archive.")
+    listing.add_argument("--archive", required=True, help="Archive file to read.")
+
+    rescoring = commands.add_parser("rescore", help="Judge and score every run of an archive.")
+    rescoring.add_argument("--archive", required=True, help="Archive file to read.")
+    rescoring.add_argument("--summary", default="summary.json", help="Summary file to write (.json or .csv).")
+    rescoring.add_argument("--score_only", action="store_true", help="Skip judging and only re-score the outputs.")
+    rescoring.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: CPU count).")
+
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        cases = find_cases(args.dir) if args.dir else read_manifest(args.manifest)
+        if not cases:
+            print("Error: No test cases found.")
+            sys.exit(1)
+        try:
+            with ArchiveWriter(args.archive, args.codec, args.level) as writer:
+                for name, input_file, output_file in cases:
+                    writer.add_files(name, input_file, output_file)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"Packed {len(cases)} runs into {args.archive} ({os.path.getsize(args.archive)} bytes)")
+
+    elif args.command == "list":
+        with ArchiveReader(args.archive) as reader:
+            for name, run in reader.runs.items():
+                error = run["input_error"] or run["output_error"]
+                print(f"{name}: {run['requests']['count']} requests, {run['events']['count']} events"
+                      + (f", parse error: {error[1]}" if error else ""))
+
+    else:
+        results = rescore(args.archive, args.workers, args.score_only)
+        write_summary(results, args.summary)
+        failed = [r for r in results if r["verdict"] not in ("Accepted", "Scored")]
+        print(f"{'Scored' if args.score_only else 'Accepted'}: {len(results) - len(failed)}/{len(results)}")
+        for r in failed:
+            print(f"{r['case']}: {r['verdict']}: {r['error']}")
+        if failed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
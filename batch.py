@@ -0,0 +1,149 @@
+import os
+import sys
+import csv
+import json
+import argparse
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+
+from cache import open_cache
+from judge import ElevatorValidator, ValidationError
+from score import calculate_performance_score
+from simulator import baseline_metrics
+
+SUMMARY_FIELDS = ["case", "verdict", "error", "Trun", "WT", "W", "T_p50", "T_p95", "T_p99", "T_max",
+                  "Trun_norm", "WT_norm", "W_norm"]
+NORMALIZED_METRICS = ["Trun", "WT", "W"]
+
+
+def find_cases(directory):
+    """
+    Collects (case, input_file, output_file) triples from a directory.
+
+    Every subdirectory holding an input.txt and an output.txt is one case,
+    named after the subdirectory.
+    """
+    cases = []
+    for name in sorted(os.listdir(directory)):
+        case_dir = os.path.join(directory, name)
+        input_file = os.path.join(case_dir, "input.txt")
+        output_file = os.path.join(case_dir, "output.txt")
+        if os.path.isfile(input_file) and os.path.isfile(output_file):
+            cases.append((name, input_file, output_file))
+    return cases
+
+
+def read_manifest(manifest_file):
+    """
+    Reads (case, input_file, output_file) triples from a manifest.
+
+    Each non-empty line is "<input_file> <output_file> [case]"; relative
+    paths are resolved against the manifest's directory.
+    """
+    base = os.path.dirname(os.path.abspath(manifest_file))
+    cases = []
+    with open(manifest_file, "r") as f:
+        for line in f:
+            fields = line.split()
+            if not fields or fields[0].startswith("#"):
+                continue
+            input_file = os.path.join(base, fields[0])
+            output_file = os.path.join(base, fields[1])
+            name = fields[2] if len(fields) > 2 else fields[1]
+            cases.append((name, input_file, output_file))
+    return cases
+
+
+def judge_case(case, score_only=False, baseline=False, cache_file=None):
+    """
+    Judges and scores one case. Never raises: failures become the verdict.
+    With score_only the output is assumed valid and only scored. With
+    baseline each metric is also reported as <metric>_norm, its ratio to
+    the reference scheduler of simulator.py on the same input. With
+    cache_file, verdicts and metrics of unchanged cases come from the cache.
+    """
+    name, input_file, output_file = case
+    result = {"case": name, "verdict": "Accepted", "error": "", "Trun": None, "WT": None, "W": None}
+    try:
+        cache = open_cache(cache_file) if cache_file and not score_only else None
+        key = None
+        if cache:
+            try:
+                key = cache.key(input_file, output_file)
+            except FileNotFoundError:
+                cache = None  # Let the judge report the missing file as usual
+        cached = cache.get(key) if cache else None
+        if cached is not None:
+            result.update(cached)
+        else:
+            try:
+                if score_only:
+                    result["verdict"] = "Scored"
+                else:
+                    ElevatorValidator(input_file, output_file).validate()
+                result.update(calculate_performance_score(input_file, output_file))
+            except ValidationError as e:
+                result["verdict"] = "Wrong Answer"
+                result["error"] = str(e)
+            if cache:
+                cache.put(key, {k: v for k, v in result.items() if k != "case"})
+        if baseline and result["verdict"] != "Wrong Answer":
+            reference = baseline_metrics(input_file)
+            for metric in NORMALIZED_METRICS:
+                result[f"{metric}_norm"] = result[metric] / reference[metric] if reference[metric] else None
+    except Exception as e:
+        result["verdict"] = "Judge Error"
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def run_batch(cases, workers=None, score_only=False, baseline=False, cache_file=None):
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(cases) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        worker = partial(judge_case, score_only=score_only, baseline=baseline, cache_file=cache_file)
+        return list(executor.map(worker, cases, chunksize=chunksize))
+
+
+def write_summary(results, summary_file):
+    if summary_file.endswith(".csv"):
+        with open(summary_file, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(results)
+    else:
+        with open(summary_file, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Judge and score a batch of elevator test cases in parallel.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--dir", help="Directory with one subdirectory (input.txt + output.txt) per case.")
+    source.add_argument("--manifest", help="File listing '<input_file> <output_file> [case]' per line.")
+    parser.add_argument("--summary", default="summary.json", help="Summary file to write (.json or .csv).")
+    parser.add_argument("--score_only", action="store_true", help="Skip judging and only re-score the outputs.")
+    parser.add_argument("--baseline", action="store_true", help="Also report metrics relative to the reference scheduler.")
+    parser.add_argument("--cache", default=None, help="SQLite file caching results of unchanged cases across runs.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: CPU count).")
+
+    args = parser.parse_args()
+
+    cases = find_cases(args.dir) if args.dir else read_manifest(args.manifest)
+    if not cases:
+        print("Error: No test cases found.")
+        sys.exit(1)
+
+    results = run_batch(cases, args.workers, args.score_only, args.baseline, args.cache)
+    write_summary(results, args.summary)
+
+    failed = [r for r in results if r["verdict"] not in ("Accepted", "Scored")]
+    print(f"{'Scored' if args.score_only else 'Accepted'}: {len(results) - len(failed)}/{len(results)}")
+    for r in failed:
+        print(f"{r['case']}: {r['verdict']}: {r['error']}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
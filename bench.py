@@ -0,0 +1,205 @@
+import gc
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import resource
+import multiprocessing
+
+from events import (FLOORS, FLOOR_INDEX, ARRIVE, OPEN, CLOSE, IN, OUT,
+                    Event, Request, format_event, format_request)
+from judge import ElevatorValidator
+from ruleset import DEFAULT_RULES
+from score import calculate_performance_score
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1M": 1_000_000, "10M": 10_000_000}
+DEFAULT_THRESHOLD = 0.2  # Fail when events/sec drops more than 20% below the baseline
+DEFAULT_REPEAT = 3  # Timed runs per phase in each measuring process
+DEFAULT_ROUNDS = 3  # Fresh measuring processes per size; the best throughput counts
+MIN_SECONDS = 1.0  # Keep repeating small sizes until this much time was measured
+
+
+def synthesize_trace(num_events, input_file, output_file, seed=0):
+    """
+    Writes a judge-valid output trace of about num_events events and its input.
+
+    Passengers are served one after another, rotating over the elevators: the
+    elevator moves to the pickup floor, OPEN/IN/CLOSE, moves to the target
+    floor, OPEN/OUT/CLOSE. Both files are streamed, so memory stays flat.
+    """
+    rng = random.Random(seed)
+    elevator_floors = {elevator_id: FLOOR_INDEX["F1"] for elevator_id in range(1, 7)}
+    t = 0
+    events = 0
+    passenger_id = 0
+    with open(input_file, "w") as f_in, open(output_file, "w") as f_out:
+        while events < num_events:
+            passenger_id += 1
+            elevator_id = passenger_id % 6 + 1
+            from_floor, to_floor = rng.sample(range(len(FLOORS)), 2)
+            request_time = (t // 1000 + 1) * 1000  # One decimal, never after the pickup below
+            t = request_time
+            f_in.write(format_request(Request(request_time, passenger_id, rng.randint(1, 100),
+                                              from_floor, to_floor, elevator_id)) + "\n")
+
+            lines = []
+            floor = elevator_floors[elevator_id]
+            for target, action in ((from_floor, IN), (to_floor, OUT)):
+                step = 1 if target > floor else -1
+                while floor != target:
+                    floor += step
+                    t += DEFAULT_RULES.move_ticks[elevator_id]
+                    lines.append(Event(t, ARRIVE, floor, elevator_id))
+                lines.append(Event(t, OPEN, floor, elevator_id))
+                lines.append(Event(t, action, floor, elevator_id, passenger_id))
+                t += DEFAULT_RULES.door_ticks
+                lines.append(Event(t, CLOSE, floor, elevator_id))
+            elevator_floors[elevator_id] = floor
+            events += len(lines)
+            f_out.write("".join(format_event(e) + "\n" for e in lines))
+    return events
+
+
+def ensure_trace(data_dir, label):
+    input_file = os.path.join(data_dir, f"trace_{label}.in")
+    output_file = os.path.join(data_dir, f"trace_{label}.out")
+    if not (os.path.exists(input_file) and os.path.exists(output_file)):
+        os.makedirs(data_dir, exist_ok=True)
+        synthesize_trace(SIZES[label], input_file, output_file)
+    return input_file, output_file
+
+
+def time_rules(input_file, output_file):
+    """Seconds spent in each check during one profiled validation."""
+    validator = ElevatorValidator(input_file, output_file)
+    profile = validator.enable_profiling()
+    validator.validate()
+    return {name: seconds for name, (seconds, _) in profile.checks.items()}
+
+
+def best_time(run, repeat=DEFAULT_REPEAT, min_seconds=MIN_SECONDS):
+    """
+    Fastest of at least `repeat` timed calls of run(), repeating until
+    min_seconds were measured in total; the slower first calls act as the
+    warm-up. Like timeit, the garbage collector is off while timing.
+    """
+    best = None
+    total = 0.0
+    runs = 0
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while runs < repeat or total < min_seconds:
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+            total += elapsed
+            runs += 1
+            gc.collect()  # Outside the timed region
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best
+
+
+def measure(label, input_file, output_file, repeat=DEFAULT_REPEAT):
+    """Runs in a fresh process so ru_maxrss is the peak of this measurement only."""
+    with open(output_file, "rb") as f:
+        events = sum(1 for _ in f)
+    result = {"size": label, "events": events}
+
+    elapsed = best_time(lambda: ElevatorValidator(input_file, output_file).validate(), repeat)
+    result["validate_seconds"] = elapsed
+    result["validate_events_per_sec"] = events / elapsed
+
+    elapsed = best_time(lambda: calculate_performance_score(input_file, output_file), repeat)
+    result["score_seconds"] = elapsed
+    result["score_events_per_sec"] = events / elapsed
+
+    result["rules_seconds"] = time_rules(input_file, output_file)
+    result["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return result
+
+
+def best_of(rounds):
+    """Merges the measurements of several processes: fastest times, largest peak RSS."""
+    result = dict(rounds[0])
+    for other in rounds[1:]:
+        for phase in ("validate", "score"):
+            if other[f"{phase}_seconds"] < result[f"{phase}_seconds"]:
+                result[f"{phase}_seconds"] = other[f"{phase}_seconds"]
+                result[f"{phase}_events_per_sec"] = other[f"{phase}_events_per_sec"]
+        result["rules_seconds"] = {name: min(seconds, other["rules_seconds"].get(name, seconds))
+                                   for name, seconds in result["rules_seconds"].items()}
+        result["peak_rss_mb"] = max(result["peak_rss_mb"], other["peak_rss_mb"])
+    return result
+
+
+def compare(results, baseline, threshold):
+    """Returns a message per throughput that regressed more than threshold below the baseline."""
+    regressions = []
+    for result in results:
+        reference = baseline.get(result["size"])
+        if not reference:
+            continue
+        for key in ("validate_events_per_sec", "score_events_per_sec"):
+            if result[key] < reference[key] * (1 - threshold):
+                regressions.append(f"{result['size']} {key}: {result[key]:.0f} < baseline {reference[key]:.0f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark judge.py and score.py on synthetic valid traces.")
+    parser.add_argument("--sizes", default=",".join(SIZES), help=f"Comma-separated trace sizes out of {', '.join(SIZES)}.")
+    parser.add_argument("--data_dir", default="bench_data", help="Directory caching the synthesized traces.")
+    parser.add_argument("--baseline", default="bench_baseline.json", help="Baseline file to compare against.")
+    parser.add_argument("--save_baseline", action="store_true", help="Store this run as the new baseline.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed relative throughput drop.")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per phase in each measuring process.")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="Measuring processes per size; the fastest counts.")
+    parser.add_argument("--json", default=None, help="Optional file to write the raw results to.")
+
+    args = parser.parse_args()
+    labels = [label.strip() for label in args.sizes.split(",") if label.strip()]
+    for label in labels:
+        if label not in SIZES:
+            parser.error(f"unknown size {label}")
+
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for label in labels:
+        input_file, output_file = ensure_trace(args.data_dir, label)
+        rounds = []
+        for _ in range(max(1, args.rounds)):
+            with context.Pool(1) as pool:
+                rounds.append(pool.apply(measure, (label, input_file, output_file, args.repeat)))
+        result = best_of(rounds)
+        results.append(result)
+        rules = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in result["rules_seconds"].items())
+        print(f"{label:>4}: {result['events']} events, validate {result['validate_seconds']:.3f}s "
+              f"({result['validate_events_per_sec']:.0f} ev/s), score {result['score_seconds']:.3f}s "
+              f"({result['score_events_per_sec']:.0f} ev/s), peak RSS {result['peak_rss_mb']:.1f} MB")
+        print(f"      {rules}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({r["size"]: r for r in results}, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, "r") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for message in regressions:
+            print(f"Regression: {message}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import json
+import time
+import sqlite3
+import hashlib
+import functools
+
+from judge import RULESET_VERSION
+from score import METRICS_VERSION
+
+DEFAULT_MAX_ENTRIES = 200000
+EVICT_INTERVAL = 1000  # Inserts between two size checks of one connection
+
+
+class ResultCache:
+    """
+    Persistent judge/score results keyed by a hash of the input bytes, the
+    output bytes and the rule-set/metrics versions.
+
+    Backed by SQLite in WAL mode, so parallel workers can share one file;
+    each process opens its own connection. Once the cache holds more than
+    max_entries results, the least recently used ones are evicted; the size
+    is checked every EVICT_INTERVAL inserts, so it may overshoot by that
+    much per connection.
+    """
+
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.puts = 0
+        self.connection = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, result TEXT NOT NULL, last_access REAL NOT NULL)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access)")
+
+    @staticmethod
+    def key(input_file, output_file):
+        digest = hashlib.sha256(f"{RULESET_VERSION}/{METRICS_VERSION}".encode())
+        for path in (input_file, output_file):
+            digest.update(b"\0")
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+        return digest.hexdigest()
+
+    def get(self, key):
+        row = self.connection.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self.connection.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, key, result):
+        self.connection.execute("INSERT OR REPLACE INTO results (key, result, last_access) VALUES (?, ?, ?)",
+                                (key, json.dumps(result), time.time()))
+        self.puts += 1
+        if self.puts % EVICT_INTERVAL == 0:
+            self.evict()
+
+    def evict(self):
+        count = self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        if count > self.max_entries:
+            # Trim 10% below the bound so eviction doesn't run on every insert.
+            excess = count - self.max_entries * 9 // 10
+            self.connection.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_access LIMIT ?)", (excess,))
+
+
+@functools.lru_cache(maxsize=None)
+def open_cache(path, max_entries=DEFAULT_MAX_ENTRIES):
+    """One ResultCache per path and process."""
+    return ResultCache(path, max_entries)
@@ -0,0 +1,115 @@
+import os
+import sys
+import json
+import shlex
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from gen import PROFILES
+from stats import bootstrap_ci
+from stress import METRICS, run_seed
+
+
+def paired_differences(results_a, results_b, metric):
+    """B - A of one metric over the seeds both sides got Accepted on."""
+    return [b[metric] - a[metric] for a, b in zip(results_a, results_b)
+            if a["verdict"] == "Accepted" and b["verdict"] == "Accepted"]
+
+
+def analyze_pairs(results_a, results_b, metrics, confidence, resamples):
+    """Paired-bootstrap CI of the mean difference per metric; significant when it excludes 0."""
+    analysis = {}
+    for metric in metrics:
+        diffs = paired_differences(results_a, results_b, metric)
+        mean, low, high = bootstrap_ci(diffs, confidence, resamples)
+        analysis[metric] = {"pairs": len(diffs), "mean_diff": mean, "low": low, "high": high,
+                            "significant": len(diffs) > 1 and (low > 0 or high < 0)}
+    return analysis
+
+
+def run_compare(command_a, command_b, seeds, batch_size, min_seeds, metrics, confidence=0.95, resamples=2000,
+                workers=None, log=print, **options):
+    """
+    Runs both commands on the same seeds in batches of batch_size seeds, both
+    sides in parallel, and stops after the first batch at which at least
+    min_seeds pairs are in and every metric's difference is significant.
+    Returns (results of A, results of B, analysis) in seed order.
+    """
+    keep_dir = options.pop("keep_dir", None)
+    results_a, results_b = [], []
+    analysis = {}
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        for start in range(0, len(seeds), batch_size):
+            batch = seeds[start:start + batch_size]
+            futures_a = [executor.submit(run_seed, seed, command_a,
+                                         keep_dir=keep_dir and os.path.join(keep_dir, "a"), **options) for seed in batch]
+            futures_b = [executor.submit(run_seed, seed, command_b,
+                                         keep_dir=keep_dir and os.path.join(keep_dir, "b"), **options) for seed in batch]
+            results_a.extend(f.result() for f in futures_a)
+            results_b.extend(f.result() for f in futures_b)
+
+            analysis = analyze_pairs(results_a, results_b, metrics, confidence, resamples)
+            log(f"{len(results_a)} seeds: " + ", ".join(
+                f"{m} {a['mean_diff']:+.4f} [{a['low']:+.4f}, {a['high']:+.4f}]" for m, a in analysis.items()))
+            # Repeated looks make this a sequential test; use it to save runs, not as a final p-value.
+            if len(results_a) >= min_seeds and all(a["significant"] for a in analysis.values()):
+                break
+    return results_a, results_b, analysis
+
+
+def print_comparison(results_a, results_b, analysis, confidence):
+    for name, results in (("A", results_a), ("B", results_b)):
+        passed = sum(r["verdict"] == "Accepted" for r in results)
+        failed = [r["seed"] for r in results if r["verdict"] != "Accepted"]
+        print(f"{name}: {passed}/{len(results)} accepted" + (f", failing seeds: {' '.join(map(str, failed))}" if failed else ""))
+    for metric, a in analysis.items():
+        if not a["significant"]:
+            outcome = "no significant difference"
+        else:
+            outcome = "B better" if a["mean_diff"] < 0 else "B worse"  # Lower is better for every metric
+        print(f"{metric:>4}: B - A = {a['mean_diff']:+.4f}, {confidence:.0%} CI [{a['low']:+.4f}, {a['high']:+.4f}] "
+              f"over {a['pairs']} pairs: {outcome}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two elevator programs on the same seeds with paired bootstrap CIs.")
+    parser.add_argument("--a", required=True, help="Command running program A, e.g. \"java -jar old.jar\".")
+    parser.add_argument("--b", required=True, help="Command running program B.")
+    parser.add_argument("--seeds", type=int, default=200, help="Maximum number of seeds to run.")
+    parser.add_argument("--first_seed", type=int, default=0, help="First seed of the range.")
+    parser.add_argument("--batch_size", type=int, default=None, help="Seeds per batch between significance checks (default: workers).")
+    parser.add_argument("--min_seeds", type=int, default=20, help="Seeds to run before stopping early.")
+    parser.add_argument("--metrics", default=",".join(METRICS), help="Comma-separated metrics that must all be significant to stop.")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level of the intervals.")
+    parser.add_argument("--resamples", type=int, default=2000, help="Bootstrap resamples.")
+    parser.add_argument("--num_requests", type=int, default=50, help="Requests per generated input.")
+    parser.add_argument("--time_limit", type=int, default=50, help="Limit of input time.")
+    parser.add_argument("--profile", choices=PROFILES, default="uniform", help="Workload profile of the generated inputs.")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Wall-clock limit per run in seconds.")
+    parser.add_argument("--idle_timeout", type=float, default=10.0, help="Idle limit per run in seconds.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: CPU count).")
+    parser.add_argument("--keep_dir", default=None, help="Directory to keep the input/output of failing seeds in, under a/ and b/.")
+    parser.add_argument("--summary", default=None, help="Optional JSON file with every run and the analysis.")
+
+    args = parser.parse_args()
+    metrics = [m.strip() for m in args.metrics.split(",") if m.strip()]
+    for metric in metrics:
+        if metric not in METRICS:
+            parser.error(f"unknown metric {metric}")
+    workers = args.workers or os.cpu_count() or 1
+
+    seeds = list(range(args.first_seed, args.first_seed + args.seeds))
+    results_a, results_b, analysis = run_compare(
+        shlex.split(args.a), shlex.split(args.b), seeds, args.batch_size or workers, args.min_seeds, metrics,
+        args.confidence, args.resamples, workers, num_requests=args.num_requests, time_limit=args.time_limit,
+        timeout=args.timeout, idle_timeout=args.idle_timeout, keep_dir=args.keep_dir, profile=args.profile)
+    if args.summary:
+        with open(args.summary, "w") as f:
+            json.dump({"a": results_a, "b": results_b, "analysis": analysis}, f, indent=2)
+    print_comparison(results_a, results_b, analysis, args.confidence)
+    if any(r["verdict"] != "Accepted" for r in results_a + results_b):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
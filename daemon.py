@@ -0,0 +1,92 @@
+import os
+import json
+import signal
+import argparse
+import threading
+import socketserver
+from concurrent.futures import ProcessPoolExecutor
+
+from batch import judge_case
+from judge import run_judge
+from score import calculate_performance_score
+
+DEFAULT_SOCKET = os.environ.get("ELEVATOR_JUDGE_SOCKET", "/tmp/elevator_judge.sock")
+
+# Protocol: one JSON object per line in each direction.
+#   request:  {"op": "judge" | "score" | "case", "input_file": ..., "output_file": ...}
+#   response: {"ok": true, ...result} or {"ok": false, "error": ...}
+# "judge" returns verdict, error and stats, taking judge.py's "ruleset" file
+# and "profile" flag; stats are the --profile JSON, or null. "score" returns
+# the score.py metrics, "case" both, taking batch.py's score_only/baseline/
+# cache options. Paths must be absolute.
+
+
+def run_job(job):
+    op = job.get("op")
+    input_file, output_file = job["input_file"], job["output_file"]
+    if op == "judge":
+        verdict, error, stats = run_judge(input_file, output_file, job.get("ruleset"), job.get("profile", False))
+        return {"verdict": verdict, "error": error, "stats": stats}
+    if op == "score":
+        return calculate_performance_score(input_file, output_file)
+    if op == "case":
+        return judge_case((job.get("case", output_file), input_file, output_file),
+                          job.get("score_only", False), job.get("baseline", False), job.get("cache"))
+    raise ValueError(f"Unknown op: {op}")
+
+
+def warm_up(_):
+    return os.getpid()
+
+
+class JobHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for raw in self.rfile:
+            try:
+                job = json.loads(raw)
+                response = {"ok": True}
+                response.update(self.server.executor.submit(run_job, job).result())
+            except Exception as e:
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            self.wfile.write((json.dumps(response) + "\n").encode())
+            self.wfile.flush()
+
+
+class JudgeServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, executor):
+        self.executor = executor
+        super().__init__(socket_path, JobHandler)
+
+
+def serve(socket_path=DEFAULT_SOCKET, workers=None):
+    workers = workers or os.cpu_count() or 1
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Start every worker now so the first jobs don't pay for it
+        list(executor.map(warm_up, range(workers)))
+        server = JudgeServer(socket_path, executor)
+        signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+        print(f"Serving on {socket_path} with {workers} workers", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            os.unlink(socket_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve judge and score jobs over a Unix domain socket.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Path of the Unix domain socket.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: CPU count).")
+
+    args = parser.parse_args()
+    serve(args.socket, args.workers)
+
+
+if __name__ == "__main__":
+    main()
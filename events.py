@@ -0,0 +1,182 @@
+import re
+import sys
+
+# Shared event model for judge.py and score.py. Every line is lexed once into
+# a compact record: floors and event types are small ints, timestamps are
+# integer ten-thousandths of a second and passenger IDs are ints.
+
+TICKS_PER_SECOND = 10000
+
+FLOORS = ["B4", "B3", "B2", "B1", "F1", "F2", "F3", "F4", "F5", "F6", "F7"]
+FLOOR_INDEX = {floor: i for i, floor in enumerate(FLOORS)}
+
+ARRIVE, OPEN, CLOSE, IN, OUT = range(5)
+EVENT_NAMES = ["ARRIVE", "OPEN", "CLOSE", "IN", "OUT"]
+EVENT_CODES = {name: code for code, name in enumerate(EVENT_NAMES)}
+
+INPUT_LEXER = re.compile(r"\[(\d+)\.(\d)\](\d+)-PRI-(\d+)-FROM-([^-]+)-TO-([^-]+)-BY-(\d)")
+
+# Field kinds of the output grammar and their patterns
+FIELD_PATTERNS = {"passenger": r"(\d+)", "floor": r"([^-]+)", "elevator": r"([^-]+)"}
+DEFAULT_EVENTS = {
+    "ARRIVE": ["floor", "elevator"],
+    "OPEN": ["floor", "elevator"],
+    "CLOSE": ["floor", "elevator"],
+    "IN": ["passenger", "floor", "elevator"],
+    "OUT": ["passenger", "floor", "elevator"],
+}
+
+
+class ParseError(ValueError):
+    pass
+
+
+class Request:
+    """One passenger request from the input file."""
+    __slots__ = ("timestamp", "passenger_id", "priority", "from_floor", "to_floor", "elevator_id")
+
+    def __init__(self, timestamp, passenger_id, priority, from_floor, to_floor, elevator_id):
+        self.timestamp = timestamp
+        self.passenger_id = passenger_id
+        self.priority = priority
+        self.from_floor = from_floor
+        self.to_floor = to_floor
+        self.elevator_id = elevator_id
+
+
+class Event:
+    """One output line. passenger_id is -1 for ARRIVE/OPEN/CLOSE."""
+    __slots__ = ("timestamp", "type", "floor", "elevator_id", "passenger_id")
+
+    def __init__(self, timestamp, type, floor, elevator_id, passenger_id=-1):
+        self.timestamp = timestamp
+        self.type = type
+        self.floor = floor
+        self.elevator_id = elevator_id
+        self.passenger_id = passenger_id
+
+    def __repr__(self):
+        return f"Event({format_event(self)!r})"
+
+
+def format_timestamp(ticks):
+    return f"{ticks // TICKS_PER_SECOND}.{ticks % TICKS_PER_SECOND:04d}"
+
+
+def format_event(event):
+    if event.type == IN or event.type == OUT:
+        body = f"{event.passenger_id}-{FLOORS[event.floor]}-{event.elevator_id}"
+    else:
+        body = f"{FLOORS[event.floor]}-{event.elevator_id}"
+    return f"[{format_timestamp(event.timestamp):>9}]{EVENT_NAMES[event.type]}-{body}"
+
+
+def format_request(request):
+    return (f"[{request.timestamp // TICKS_PER_SECOND}.{request.timestamp % TICKS_PER_SECOND // 1000}]"
+            f"{request.passenger_id}-PRI-{request.priority}"
+            f"-FROM-{FLOORS[request.from_floor]}-TO-{FLOORS[request.to_floor]}-BY-{request.elevator_id}")
+
+
+class EventGrammar:
+    """
+    Output line lexer compiled from an event grammar: event name -> field
+    kinds in line order. The five standard events keep their type codes;
+    other names get the next codes in grammar order. Every event needs an
+    elevator field; floor is -1 and passenger_id -1 when absent.
+    """
+
+    def __init__(self, events=DEFAULT_EVENTS, floors=FLOORS):
+        self.floors = list(floors)
+        self.floor_index = {floor: i for i, floor in enumerate(self.floors)}
+        self.names = list(EVENT_NAMES) + [name for name in events if name not in EVENT_CODES]
+        self.codes = {name: code for code, name in enumerate(self.names)}
+
+        layouts = {}  # Field kinds -> event names sharing them
+        for name, fields in events.items():
+            if "elevator" not in fields:
+                raise ValueError(f"Event {name} has no elevator field")
+            for kind in fields:
+                if kind not in FIELD_PATTERNS:
+                    raise ValueError(f"Event {name} has unknown field kind {kind}")
+            layouts.setdefault(tuple(fields), []).append(name)
+
+        # One alternative per layout; match.lastindex, the group of its last
+        # field, tells which one matched.
+        alternatives = []
+        self.layouts = {}  # lastindex -> (name group, floor group, elevator group, passenger group)
+        group = 3
+        for fields, names in layouts.items():
+            alternatives.append("(" + "|".join(names) + ")" + "".join("-" + FIELD_PATTERNS[k] for k in fields))
+            positions = {kind: group + i for i, kind in enumerate(fields)}  # Indices into match.groups()
+            self.layouts[group + len(fields)] = (group - 1, positions.get("floor"), positions["elevator"],
+                                                 positions.get("passenger"))
+            group += 1 + len(fields)
+        self.lexer = re.compile(r"\[ *(\d+)\.(\d{4})\](?:" + "|".join(alternatives) + ")")
+
+    def parse(self, line):
+        match = self.lexer.fullmatch(line)
+        if not match:
+            raise ParseError(f"Invalid output format: {line}")
+        name_group, floor_group, elevator_group, passenger_group = self.layouts[match.lastindex]
+        groups = match.groups()
+
+        floor_code = -1
+        if floor_group is not None:
+            floor_code = self.floor_index.get(groups[floor_group])
+            if floor_code is None:
+                raise ParseError(f"Invalid floor: {groups[floor_group]}")
+        elevator_id = groups[elevator_group]
+        if not elevator_id.isdigit():
+            raise ParseError(f"Invalid elevator ID: {elevator_id}")
+        return Event(int(groups[0]) * TICKS_PER_SECOND + int(groups[1]), self.codes[groups[name_group]],
+                     floor_code, int(elevator_id), -1 if passenger_group is None else int(groups[passenger_group]))
+
+
+DEFAULT_GRAMMAR = EventGrammar()
+
+
+def parse_request(line, floor_index=FLOOR_INDEX):
+    match = INPUT_LEXER.match(line)
+    if not match:
+        raise ParseError(f"Invalid input format: {line}")
+    seconds, tenths, passenger_id, priority, from_floor, to_floor, elevator_id = match.groups()
+    from_code = floor_index.get(from_floor)
+    to_code = floor_index.get(to_floor)
+    if from_code is None or to_code is None:
+        raise ParseError(f"Invalid input format: {line}")
+    return Request(int(seconds) * TICKS_PER_SECOND + int(tenths) * 1000, int(passenger_id), int(priority),
+                   from_code, to_code, int(elevator_id))
+
+
+parse_event = DEFAULT_GRAMMAR.parse
+
+
+def read_requests(stream, skip_invalid=False, floor_index=FLOOR_INDEX):
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield parse_request(line, floor_index)
+        except ParseError:
+            if not skip_invalid:
+                raise
+
+
+def read_events(stream, skip_invalid=False):
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield parse_event(line)
+        except ParseError:
+            if not skip_invalid:
+                raise
+
+
+def open_stream(path):
+    """Open a file for line-by-line reading, "-" meaning stdin."""
+    if path == "-":
+        return sys.stdin
+    return open(path, 'r')
@@ -0,0 +1,107 @@
+import sys
+import time
+import asyncio
+import argparse
+
+from events import TICKS_PER_SECOND, parse_request
+from stats import summarize
+
+SPIN_SECONDS = 0.001  # Finish the last millisecond of each wait by yielding, not sleeping
+
+
+class RequestFeeder:
+    """
+    Writes input requests to a child's stdin at their timestamp offsets.
+
+    Requests sharing a timestamp go out in a single write. Offsets are taken
+    against time.monotonic(), and the actual send time of every line is kept
+    in `send_times` so feed latency can be told apart from program latency.
+    """
+
+    def __init__(self, lines):
+        self.batches = []  # [(offset in seconds, [line, ...])] in timestamp order
+        for line in lines:
+            offset = parse_request(line).timestamp / TICKS_PER_SECOND
+            if self.batches and self.batches[-1][0] == offset:
+                self.batches[-1][1].append(line)
+            else:
+                self.batches.append((offset, [line]))
+        self.send_times = []  # (scheduled offset, actual offset, line) per line
+        self.next_send = None  # Monotonic time of the next pending batch
+
+    @classmethod
+    def from_file(cls, input_file):
+        with open(input_file, "r") as f:
+            return cls([line.strip() for line in f if line.strip()])
+
+    async def run(self, stdin, start):
+        """Feeds every batch relative to `start` and closes stdin afterwards."""
+        try:
+            for offset, lines in self.batches:
+                target = start + offset
+                self.next_send = target
+                delay = target - time.monotonic() - SPIN_SECONDS
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                while time.monotonic() < target:
+                    await asyncio.sleep(0)
+                stdin.write("".join(line + "\n" for line in lines).encode())
+                sent = time.monotonic() - start
+                self.send_times.extend((offset, sent, line) for line in lines)
+                await stdin.drain()
+            self.next_send = None
+            stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            self.next_send = None
+
+    def latency_report(self):
+        """Feed latency (actual minus scheduled send time) percentiles in milliseconds."""
+        return summarize([(sent - offset) * 1000 for offset, sent, _ in self.send_times])
+
+
+def format_latency(report):
+    return (f"Feed latency (ms) over {report['count']} requests: p50 {report['p50']:.3f}, "
+            f"p95 {report['p95']:.3f}, p99 {report['p99']:.3f}, max {report['max']:.3f}")
+
+
+async def feed_process(command, feeder, send_log=None):
+    start = time.monotonic()
+    process = await asyncio.create_subprocess_exec(*command, stdin=asyncio.subprocess.PIPE)
+    await feeder.run(process.stdin, start)
+    returncode = await process.wait()
+    if send_log:
+        with open(send_log, "w") as f:
+            for offset, sent, line in feeder.send_times:
+                f.write(f"{offset:.4f} {sent:.6f} {line}\n")
+    return returncode
+
+
+def add_command_argument(parser):
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="Command running the program under test, e.g. -- java -jar elevator.jar")
+
+
+def program_command(parser, args):
+    """The command given after the options, without a leading --; exits with a usage error if it's empty."""
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+    if not command:
+        parser.error("no program command given")
+    return command
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Feed timed requests to an elevator program; its stdout passes through.")
+    parser.add_argument("--input_file", default="/root/OO_unit2/input.txt", help="Path to the input file (generated by gen.py).")
+    parser.add_argument("--send_log", default=None, help="Optional file recording 'scheduled actual request' per line.")
+    add_command_argument(parser)
+
+    args = parser.parse_args()
+    command = program_command(parser, args)
+
+    feeder = RequestFeeder.from_file(args.input_file)
+    returncode = asyncio.run(feed_process(command, feeder, args.send_log))
+    print(format_latency(feeder.latency_report()), file=sys.stderr)
+    sys.exit(returncode)
+
+
+if __name__ == "__main__":
+    main()
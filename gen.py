@@ -1,78 +1,122 @@
+import sys
 import random
-import time
 import argparse
+import itertools
 
-def generate_request(passenger_id, timestamp, floors, elevator_ids, priority):
-    from_floor = random.choice(floors)
-    to_floor = random.choice(floors)
-    while from_floor == to_floor:
-        to_floor = random.choice(floors)
+FLOORS = ["B4", "B3", "B2", "B1", "F1", "F2", "F3", "F4", "F5", "F6", "F7"]
+ELEVATOR_IDS = list(range(1, 7))
 
-    elevator_id = random.choice(elevator_ids)
+PROFILES = ["uniform", "morning", "evening", "hotspot", "burst", "idle"]
+RUSH_SHARE = 0.8  # 早/晚高峰中从 F1 出发 / 到达 F1 的请求比例
+IDLE_WINDOWS = 3  # idle 模式下的活跃时段数, 相邻时段之间的空闲时长是活跃时段的 4 倍
 
-    return f"[{timestamp:.1f}]{passenger_id}-PRI-{priority}-FROM-{from_floor}-TO-{to_floor}-BY-{elevator_id}"
-
-def generate_random_floats_one_decimal(num: int, min_val: float = 0.0, max_val: float = 1.0):
+def sorted_uniforms(num, rng):
     """
-    生成一个包含指定数量随机浮点数的列表, 每个浮点数精确到小数点后一位。
-
-    Args:
-        num: 需要生成的随机浮点数的数量。
-        min_val: 随机浮点数的最小值 (包含)。默认为 0.0。
-        max_val: 随机浮点数的最大值 (包含)。默认为 1.0。
-
-    Returns:
-        一个包含 num 个随机浮点数的列表, 每个数都精确到一位小数。
-
-    Raises:
-        ValueError: 如果 num 为负数或 min_val > max_val。
+    按升序逐个产生 num 个 [0, 1) 上均匀分布的随机数, 与生成后排序同分布, 但只占用常数内存。
     """
-    if num < 1:
-        raise ValueError("生成的数量 'num' 不能小于 1")
-    if min_val > max_val:
-        raise ValueError(f"最小值 'min_val' ({min_val}) 不能大于最大值 'max_val' ({max_val})")
+    current = 1.0
+    for i in range(num, 0, -1):
+        current *= rng.random() ** (1.0 / i)
+        yield 1.0 - current
 
-    random_list = list()
-    for _ in range(num):
-        # 1. 生成一个在 min_val 和 max_val 之间的原始随机浮点数
-        raw_float = random.uniform(min_val, max_val)
-
-        # 2. 通过乘以10, 四舍五入到整数, 再除以10.0 来确保一位小数精度
-        #    直接使用 round(raw_float, 1) 可能因浮点数表示问题产生微小误差 (如 0.300000000004)
-        #    这种方法通常能更好地控制精度值。
-        precise_float = round(raw_float * 10) / 10.0
-
-        random_list.append(precise_float)
+def generate_timestamps(num, min_val, max_val, rng, profile="uniform", burst_size=20):
+    """
+    按升序逐个产生 num 个精确到一位小数的时间戳。
 
-    return sorted(random_list)
+    burst 模式下每 burst_size 个请求共享同一个时间戳; idle 模式下请求集中在
+    IDLE_WINDOWS 个活跃时段内, 时段之间是长时间的空闲。
+    """
+    span = max_val - min_val
+    if profile == "burst":
+        remaining = num
+        for u in sorted_uniforms((num + burst_size - 1) // burst_size, rng):
+            timestamp = round((min_val + u * span) * 10) / 10.0
+            for _ in range(min(burst_size, remaining)):
+                yield timestamp
+            remaining -= burst_size
+    elif profile == "idle" and span <= 0:
+        # 时间范围为空时没有空闲时段可分, 所有请求都落在 min_val
+        for _ in range(num):
+            yield min_val
+    elif profile == "idle":
+        window = span / (IDLE_WINDOWS + 4 * (IDLE_WINDOWS - 1))
+        for u in sorted_uniforms(num, rng):
+            active = u * IDLE_WINDOWS * window
+            index = min(int(active / window), IDLE_WINDOWS - 1)
+            yield round((min_val + active + index * 4 * window) * 10) / 10.0
+    else:
+        for u in sorted_uniforms(num, rng):
+            yield round((min_val + u * span) * 10) / 10.0
+
+def iter_requests(num_requests, time_limit=50, seed=None, profile="uniform", hotspot_elevator=1, burst_size=20):
+    """
+    按时间顺序逐条产生 num_requests 条请求, 只占用常数内存, 相同参数与 seed 总是得到相同的请求。
+
+    profile:
+        uniform: 楼层与电梯均匀随机。
+        morning: 早高峰, 大部分请求从 F1 出发。
+        evening: 晚高峰, 大部分请求到达 F1。
+        hotspot: 所有请求都指定电梯 hotspot_elevator。
+        burst: 每 burst_size 个请求在同一时刻到达。
+        idle: 请求集中在少数时段, 中间有长时间空闲。
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"未知的 profile: {profile}")
+    rng = random.Random(seed)
+    upper = [floor for floor in FLOORS if floor != "F1"]
+    timestamps = generate_timestamps(num_requests, 1.0, time_limit, rng, profile, burst_size)
+    for passenger_id, timestamp in enumerate(timestamps, start=1):
+        priority = rng.randint(1, 100)
+        if profile == "morning" and rng.random() < RUSH_SHARE:
+            from_floor, to_floor = "F1", rng.choice(upper)
+        elif profile == "evening" and rng.random() < RUSH_SHARE:
+            from_floor, to_floor = rng.choice(upper), "F1"
+        else:
+            from_floor = rng.choice(FLOORS)
+            to_floor = rng.choice(FLOORS)
+            while from_floor == to_floor:
+                to_floor = rng.choice(FLOORS)
+        elevator_id = hotspot_elevator if profile == "hotspot" else rng.choice(ELEVATOR_IDS)
+        yield f"[{timestamp:.1f}]{passenger_id}-PRI-{priority}-FROM-{from_floor}-TO-{to_floor}-BY-{elevator_id}"
+
+def generate_requests(num_requests, time_limit=50, seed=None, profile="uniform"):
+    """
+    生成 num_requests 条请求并按时间顺序返回, 相同 seed 总是得到相同的请求。
+    """
+    return list(iter_requests(num_requests, time_limit, seed, profile))
 
 def main():
     parser = argparse.ArgumentParser(description="Generate elevator simulation requests.")
-    parser.add_argument("--num_requests", type=int, default=50, help="Number of requests to generate (1-100).")
+    parser.add_argument("--num_requests", type=int, default=50, help="Number of requests to generate (the assignment allows 1-100; more for stress tests).")
     parser.add_argument("--time_limit", type=int, default=50, help="Limit of input time(1.0-50.0)")
     parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducibility.")
+    parser.add_argument("--profile", choices=PROFILES, default="uniform", help="Workload profile.")
+    parser.add_argument("--hotspot_elevator", type=int, choices=ELEVATOR_IDS, default=1, help="Elevator every request uses in the hotspot profile.")
+    parser.add_argument("--burst_size", type=int, default=20, help="Requests sharing one timestamp in the burst profile.")
+    parser.add_argument("--output", default=None, help="File to write the requests to (default: stdout).")
 
     args = parser.parse_args()
 
-    if not 1 <= args.num_requests <= 100:
-        print("Error: Number of requests must be between 1 and 100.")
+    if args.num_requests < 1:
+        print("Error: Number of requests must be at least 1.")
+        return
+    if args.time_limit < 1:
+        print("Error: Time limit must be at least 1.")
+        return
+    if args.burst_size < 1:
+        print("Error: Burst size must be at least 1.")
         return
 
-    if args.seed is not None:
-        random.seed(args.seed)
-
-    floors = ["B4", "B3", "B2", "B1", "F1", "F2", "F3", "F4", "F5", "F6", "F7"]
-    elevator_ids = list(range(1, 7))
-    passenger_id_counter = 1
-    timestamps = generate_random_floats_one_decimal(args.num_requests, min_val=1.0, max_val=args.time_limit)
-    for i in range(args.num_requests):
-        passenger_id = f"{passenger_id_counter}"
-        priority = random.randint(1, 100)
-        timestamp = timestamps[i]
-        request = generate_request(passenger_id, timestamp, floors, elevator_ids, priority)
-        print(request)
-
-        passenger_id_counter += 1
+    out = open(args.output, "w") if args.output else sys.stdout
+    requests = iter_requests(args.num_requests, args.time_limit, args.seed, args.profile,
+                             args.hotspot_elevator, args.burst_size)
+    while True:
+        chunk = list(itertools.islice(requests, 10000))
+        if not chunk:
+            break
+        out.write("\n".join(chunk) + "\n")
+    if out is not sys.stdout:
+        out.close()
 
 
 if __name__ == "__main__":
@@ -1,354 +1,377 @@
-import re
+import sys
+import json
+import time
 import argparse
 
+from events import (TICKS_PER_SECOND, ARRIVE, OPEN, CLOSE, IN, OUT, EVENT_NAMES,
+                    ParseError, format_timestamp, open_stream, read_requests)
+from ruleset import Ruleset, load_ruleset
+from stats import summarize
+
 class ValidationError(Exception):
     pass
 
+RULESET_VERSION = "1"  # Bump whenever a rule changes, to invalidate cached verdicts
+
+
+class ElevatorState:
+    """Per-elevator state shared by the rule handlers."""
+    __slots__ = ("floor", "door", "move_timestamp", "door_timestamp", "passengers")
+
+    def __init__(self, floor):
+        self.floor = floor  # Initial position
+        self.door = CLOSE
+        self.move_timestamp = 0
+        self.door_timestamp = 0
+        self.passengers = set()
+
+
+class ValidatorProfile:
+    """Per-check wall time and call counts plus per-elevator counters of one validation."""
+
+    def __init__(self, event_names=EVENT_NAMES):
+        self.event_names = event_names
+        self.checks = {}  # check name -> [seconds, events]
+        self.elevator_events = {}  # elevator_id -> events per type
+        self.max_load = {}  # elevator_id -> most passengers inside at once
+        self.dwell_times = {}  # elevator_id -> OPEN..CLOSE durations in seconds
+        self.open_times = {}
+        self.load = 0
+        self.max_concurrent_load = 0
+
+    def timed(self, handler):
+        counters = self.checks.setdefault(handler.__name__, [0.0, 0])
+
+        def wrapper(*args):
+            start = time.perf_counter()
+            try:
+                return handler(*args)
+            finally:
+                counters[0] += time.perf_counter() - start
+                counters[1] += 1
+        wrapper.__name__ = handler.__name__
+        return wrapper
+
+    def to_dict(self):
+        return {
+            "checks": {name: {"seconds": seconds, "events": events} for name, (seconds, events) in self.checks.items()},
+            "elevators": {
+                elevator_id: {
+                    "events": dict(zip(self.event_names, counts)),
+                    "max_load": self.max_load.get(elevator_id, 0),
+                    "door_dwell": summarize(self.dwell_times.get(elevator_id, [])),
+                } for elevator_id, counts in sorted(self.elevator_events.items())
+            },
+            "max_concurrent_load": self.max_concurrent_load,
+        }
+
+
 class ElevatorValidator:
-    def __init__(self, input_file, output_file):
+    def __init__(self, input_file, output_file, ruleset=None):
         self.input_file = input_file
         self.output_file = output_file
-        self.input_requests = []
-        self.output_events = []
-        self.floors = ["B4", "B3", "B2", "B1", "F1", "F2", "F3", "F4", "F5", "F6", "F7"]
-        self.elevator_ids = list(range(1, 7))
-
-    def load_data(self):
+        self.ruleset = ruleset or Ruleset()
+        self.grammar = self.ruleset.grammar
+        self.floors = self.grammar.floors
+        self.elevator_ids = set(self.ruleset.capacities)
+        self.capacities = self.ruleset.capacities
+        self.move_ticks = self.ruleset.move_ticks
+        self.door_ticks = self.ruleset.door_ticks
+        self.tolerance_ticks = self.ruleset.tolerance_ticks
+        self.uses_receive = "RECEIVE" in self.grammar.codes
+
+        self.passenger_requests = {}  # passenger_id -> Request
+        self.completed = set()
+        self.elevators = {}
+        self.last_timestamp = 0
+        self.last_event = None
+        self.events_processed = 0
+        self.received = {}  # passenger_id -> elevator_id, with RECEIVE events
+
+        # Rule handlers run for each event type code, in order.
+        self.handlers = self.ruleset.compile(self)
+        self.profile = None
+
+    def enable_profiling(self):
+        """Time every check and collect per-elevator counters into self.profile."""
+        self.profile = ValidatorProfile(self.grammar.names)
+        wrappers = {}
+        for event_type, handlers in enumerate(self.handlers):
+            for handler in handlers:
+                if handler.__name__ not in wrappers:
+                    wrappers[handler.__name__] = self.profile.timed(handler)
+            self.handlers[event_type] = tuple(wrappers[h.__name__] for h in handlers) + (self.collect_stats,)
+        self.validate_initial_state = self.profile.timed(self.validate_initial_state)
+        self.validate_final_state = self.profile.timed(self.validate_final_state)
+        return self.profile
+
+    def collect_stats(self, event):
+        profile = self.profile
+        elevator_id = event.elevator_id
+        counts = profile.elevator_events.get(elevator_id)
+        if counts is None:
+            counts = profile.elevator_events[elevator_id] = [0] * len(self.grammar.names)
+        counts[event.type] += 1
+        if event.type == IN:
+            profile.load += 1
+            profile.max_concurrent_load = max(profile.max_concurrent_load, profile.load)
+            load = len(self.elevator(elevator_id).passengers)
+            profile.max_load[elevator_id] = max(profile.max_load.get(elevator_id, 0), load)
+        elif event.type == OUT:
+            profile.load -= 1
+        elif event.type == OPEN:
+            profile.open_times[elevator_id] = event.timestamp
+        elif event.type == CLOSE:
+            dwell = (event.timestamp - profile.open_times.get(elevator_id, event.timestamp)) / TICKS_PER_SECOND
+            profile.dwell_times.setdefault(elevator_id, []).append(dwell)
+
+    def load_requests(self):
+        """Read and check the input file, keeping one record per passenger."""
         try:
-            with open(self.input_file, 'r') as f_in, open(self.output_file, 'r') as f_out:
-                self.input_requests = [line.strip() for line in f_in.readlines()]
-                self.output_events = [line.strip() for line in f_out.readlines()]
+            with open_stream(self.input_file) as f_in:
+                for request in read_requests(f_in, floor_index=self.grammar.floor_index):
+                    self.passenger_requests[request.passenger_id] = request
         except FileNotFoundError as e:
             raise ValidationError(f"File not found: {e}")
-
-    def validate_input_format(self):
-        input_pattern = re.compile(r"\[(\d+\.\d)\](\d+)-PRI-(\d+)-FROM-(B[1-4]|F[1-7])-TO-(B[1-4]|F[1-7])-BY-(\d)")
-        for line in self.input_requests:
-            if not input_pattern.match(line):
-                raise ValidationError(f"Invalid input format: {line}")
-
-    def validate_output_format(self):
-        output_pattern = re.compile(r"\[( )*(\d+\.(\d){4})\](ARRIVE|OPEN|CLOSE|IN|OUT)-(.+)")
-        for line in self.output_events:
-            if not output_pattern.match(line):
-                raise ValidationError(f"Invalid output format: {line}")
-
-    def validate_timestamps(self):
-        timestamps = []
-        for line in self.output_events:
-            match = re.match(r"\[(\d+\.\d)\]", line)
-            if match:
-                timestamps.append(float(match.group(1)))
-
-        for i in range(1, len(timestamps)):
-            if timestamps[i] < timestamps[i-1]:
-                raise ValidationError(f"Timestamp is not monotonically increasing: {timestamps[i]} < {timestamps[i-1]}")
-
-    def validate_floor_and_elevator_ids(self):
-        for line in self.output_events:
-            parts = line.split('-')
-            event_type = parts[0].split(']')[1]
-
-            if event_type in ["ARRIVE", "OPEN", "CLOSE"]:
-                floor = parts[1]
-                elevator_id = parts[2]
-                if floor not in self.floors:
-                    raise ValidationError(f"Invalid floor: {floor}")
-                if not elevator_id.isdigit() or int(elevator_id) not in self.elevator_ids:
-                    raise ValidationError(f"Invalid elevator ID: {elevator_id}")
-            elif event_type in ["IN", "OUT"]:
-                floor = parts[2]
-                elevator_id = parts[3]
-                if floor not in self.floors:
-                    raise ValidationError(f"Invalid floor: {floor}")
-                if not elevator_id.isdigit() or int(elevator_id) not in self.elevator_ids:
-                    raise ValidationError(f"Invalid elevator ID: {elevator_id}")
-
-    def validate_elevator_movement(self):
-        elevator_positions = {}  # Store the last position and timestamp of each elevator
-        for line in self.output_events:
-            parts = line.split('-')
-            event_type = parts[0].split(']')[1]
-            timestamp = float(parts[0].split('[')[1].split(']')[0])
-
-            if event_type == "CLOSE":
-                elevator_id = int(parts[2])
-                if elevator_id not in elevator_positions:
-                    elevator_positions[elevator_id] = {"floor": "F1", "timestamp": 0.0}  # Initial position
-                elevator_positions[elevator_id]["timestamp"] = timestamp
-            elif event_type == "ARRIVE":
-                floor = parts[1]
-                elevator_id = int(parts[2])
-
-                if elevator_id not in elevator_positions:
-                    elevator_positions[elevator_id] = {"floor": "F1", "timestamp": 0.0}  # Initial position
-
-                last_floor = elevator_positions[elevator_id]["floor"]
-                last_timestamp = elevator_positions[elevator_id]["timestamp"]
-
-                floor_index = self.floors.index(floor)
-                last_floor_index = self.floors.index(last_floor)
-
-                if abs(floor_index - last_floor_index) != 1:
-                    raise ValidationError(f"Elevator moved more than one floor at a time: {last_floor} -> {floor}")
-
-                time_diff = timestamp - last_timestamp
-                if time_diff - 0.4 < -0.001:  # Allow for small floating-point errors
-                    raise ValidationError(f"Invalid elevator movement time: {time_diff:.3f}s, expected >0.4s")
-
-                elevator_positions[elevator_id]["floor"] = floor
-                elevator_positions[elevator_id]["timestamp"] = timestamp
-
-    def validate_door_operation(self):
-        elevator_door_status = {}  # Store the last door status (OPEN or CLOSE) and timestamp of each elevator
-        for line in self.output_events:
-            parts = line.split('-')
-            event_type = parts[0].split(']')[1]
-            timestamp = float(parts[0].split('[')[1].split(']')[0])
-            
-            if event_type == "OPEN":
-                floor = parts[1]
-                elevator_id = int(parts[2])
-
-                if elevator_id not in elevator_door_status:
-                    elevator_door_status[elevator_id] = {"status": "CLOSE", "timestamp": 0.0}
-
-                last_status = elevator_door_status[elevator_id]["status"]
-                last_timestamp = elevator_door_status[elevator_id]["timestamp"]
-
-                if last_status == "OPEN":
-                    raise ValidationError(f"Door opened before closing: Elevator {elevator_id}")
-
-                elevator_door_status[elevator_id]["status"] = "OPEN"
-                elevator_door_status[elevator_id]["timestamp"] = timestamp
-
-            elif event_type == "CLOSE":
-                floor = parts[1]
-                elevator_id = int(parts[2])
-
-                if elevator_id not in elevator_door_status:
-                    raise ValidationError(f"Door closed before opening: Elevator {elevator_id}")
-
-                last_status = elevator_door_status[elevator_id]["status"]
-                last_timestamp = elevator_door_status[elevator_id]["timestamp"]
-
-                if last_status == "CLOSE":
-                    raise ValidationError(f"Door closed before opening: Elevator {elevator_id}")
-
-                time_diff = timestamp - last_timestamp
-                if time_diff - 0.4 < -0.001:
-                    raise ValidationError(f"Door operation time less than 0.4s: {time_diff:.1f}s")
-
-                elevator_door_status[elevator_id]["status"] = "CLOSE"
-                elevator_door_status[elevator_id]["timestamp"] = timestamp
-
-    def validate_passenger_in_out(self):
-        elevator_passengers = {}  # Store the passengers in each elevator
-        passenger_requests = {}  # Store the requests of each passenger
-        
-        # Parse input requests to store passenger information
-        input_pattern = re.compile(r"\[(\d+\.\d)\](\d+)-PRI-(\d+)-FROM-(B[1-4]|F[1-7])-TO-(B[1-4]|F[1-7])-BY-(\d)")
-        for line in self.input_requests:
-            match = input_pattern.match(line)
-            if match:
-                timestamp, passenger_id, priority, from_floor, to_floor, elevator_id = match.groups()
-                passenger_requests[passenger_id] = {
-                    "from_floor": from_floor,
-                    "to_floor": to_floor,
-                    "elevator_id": int(elevator_id),
-                }
-
-        for line in self.output_events:
-            parts = line.split('-')
-            event_type = parts[0].split(']')[1]
-            timestamp = float(parts[0].split('[')[1].split(']')[0])
-
-            if event_type == "IN":
-                passenger_id = parts[1]
-                floor = parts[2]
-                elevator_id = int(parts[3])
-
-                if elevator_id not in elevator_passengers:
-                    elevator_passengers[elevator_id] = []
-
-                if passenger_id in elevator_passengers[elevator_id]:
-                    raise ValidationError(f"Passenger already in elevator: {passenger_id} in Elevator {elevator_id}")
-
-                if passenger_requests[passenger_id]["from_floor"] != floor:
-                     raise ValidationError(f"Passenger entered on wrong floor: {passenger_id} on Floor {floor}, expected {passenger_requests[passenger_id]['from_floor']}")
-
-                if passenger_requests[passenger_id]["elevator_id"] != elevator_id:
-                    raise ValidationError(f"Passenger entered wrong elevator: {passenger_id} in Elevator {elevator_id}, expected {passenger_requests[passenger_id]['elevator_id']}")
-                
-                elevator_passengers[elevator_id].append(passenger_id)
-
-            elif event_type == "OUT":
-                passenger_id = parts[1]
-                floor = parts[2]
-                elevator_id = int(parts[3])
-
-                if elevator_id not in elevator_passengers:
-                    raise ValidationError(f"Passenger exited from empty elevator: {passenger_id} from Elevator {elevator_id}")
-
-                if passenger_id not in elevator_passengers[elevator_id]:
-                    raise ValidationError(f"Passenger not in elevator during exit: {passenger_id} from Elevator {elevator_id}")
-
-                if passenger_requests[passenger_id]["to_floor"] != floor:
-                    raise ValidationError(f"Passenger exited on wrong floor: {passenger_id} on Floor {floor}, expected {passenger_requests[passenger_id]['to_floor']}")
-
-                elevator_passengers[elevator_id].remove(passenger_id)
-
-    def validate_elevator_capacity(self):
-        elevator_passengers = {}  # Store the passengers in each elevator
-
-        for line in self.output_events:
-            parts = line.split('-')
-            event_type = parts[0].split(']')[1]
-            timestamp = float(parts[0].split('[')[1].split(']')[0])
-
-            if event_type == "IN":
-                passenger_id = parts[1]
-                elevator_id = int(parts[3])
-
-                if elevator_id not in elevator_passengers:
-                    elevator_passengers[elevator_id] = []
-
-                elevator_passengers[elevator_id].append(passenger_id)
-
-                if len(elevator_passengers[elevator_id]) > 6:
-                    raise ValidationError(f"Elevator capacity exceeded: Elevator {elevator_id} has {len(elevator_passengers[elevator_id])} passengers")
-
-            elif event_type == "OUT":
-                passenger_id = parts[1]
-                elevator_id = int(parts[3])
-
-                if elevator_id not in elevator_passengers:
-                    raise ValidationError(f"Passenger exited from empty elevator: {passenger_id} from Elevator {elevator_id}")
-
-                if passenger_id not in elevator_passengers[elevator_id]:
-                    raise ValidationError(f"Passenger not in elevator during exit: {passenger_id} from Elevator {elevator_id}")
-
-                elevator_passengers[elevator_id].remove(passenger_id)
-
-    def validate_initial_state(self):
+        except ParseError as e:
+            raise ValidationError(str(e))
+
+    def feed(self, line):
+        """Parse one output line and validate it."""
+        line = line.strip()
+        if not line:
+            return
+        try:
+            event = self.grammar.parse(line)
+        except ParseError as e:
+            raise ValidationError(str(e))
+        self.process(event)
+
+    def process(self, event):
+        """Validate one event against every rule for its event type."""
+        if self.events_processed == 0:
+            self.validate_initial_state(event)
+        for handler in self.handlers[event.type]:
+            handler(event)
+        self.last_event = event
+        self.events_processed += 1
+
+    def elevator(self, elevator_id):
+        state = self.elevators.get(elevator_id)
+        if state is None:
+            state = self.elevators[elevator_id] = ElevatorState(self.ruleset.initial_floor)
+        return state
+
+    def validate_timestamps(self, event):
+        if event.timestamp < self.last_timestamp:
+            raise ValidationError(f"Timestamp is not monotonically increasing: "
+                                  f"{format_timestamp(event.timestamp)} < {format_timestamp(self.last_timestamp)}")
+        self.last_timestamp = event.timestamp
+
+    def validate_floor_and_elevator_ids(self, event):
+        # Floors are checked by the lexer; only the elevator range is left.
+        if event.elevator_id not in self.elevator_ids:
+            raise ValidationError(f"Invalid elevator ID: {event.elevator_id}")
+
+    def validate_elevator_movement(self, event):
+        state = self.elevator(event.elevator_id)
+        if event.type == CLOSE:
+            state.move_timestamp = event.timestamp
+            return
+
+        last_floor = state.floor
+        if abs(event.floor - last_floor) != 1:
+            raise ValidationError(f"Elevator moved more than one floor at a time: {self.floors[last_floor]} -> {self.floors[event.floor]}")
+
+        time_diff = event.timestamp - state.move_timestamp
+        move_ticks = self.move_ticks[event.elevator_id]
+        if time_diff < move_ticks - self.tolerance_ticks:
+            raise ValidationError(f"Invalid elevator movement time: {time_diff / TICKS_PER_SECOND:.3f}s, "
+                                  f"expected >{move_ticks / TICKS_PER_SECOND:g}s")
+
+        state.floor = event.floor
+        state.move_timestamp = event.timestamp
+
+    def validate_door_operation(self, event):
+        state = self.elevator(event.elevator_id)
+        if event.type == OPEN:
+            if state.door == OPEN:
+                raise ValidationError(f"Door opened before closing: Elevator {event.elevator_id}")
+            state.door = OPEN
+            state.door_timestamp = event.timestamp
+            return
+
+        if state.door == CLOSE:
+            raise ValidationError(f"Door closed before opening: Elevator {event.elevator_id}")
+
+        time_diff = event.timestamp - state.door_timestamp
+        if time_diff < self.door_ticks - self.tolerance_ticks:
+            raise ValidationError(f"Door operation time less than {self.door_ticks / TICKS_PER_SECOND:g}s: "
+                                  f"{time_diff / TICKS_PER_SECOND:.1f}s")
+
+        state.door = CLOSE
+        state.door_timestamp = event.timestamp
+
+    def validate_passenger_in_out(self, event):
+        passenger_id = event.passenger_id
+        elevator_id = event.elevator_id
+        request = self.passenger_requests.get(passenger_id)
+        if request is None:
+            raise ValidationError(f"Unknown passenger: {passenger_id}")
+        passengers = self.elevator(elevator_id).passengers
+
+        if event.type == IN:
+            if passenger_id in passengers:
+                raise ValidationError(f"Passenger already in elevator: {passenger_id} in Elevator {elevator_id}")
+
+            if request.from_floor != event.floor:
+                raise ValidationError(f"Passenger entered on wrong floor: {passenger_id} on Floor {self.floors[event.floor]}, expected {self.floors[request.from_floor]}")
+
+            if self.uses_receive:
+                if self.received.get(passenger_id) != elevator_id:
+                    raise ValidationError(f"Passenger entered elevator without RECEIVE: {passenger_id} in Elevator {elevator_id}")
+            elif request.elevator_id != elevator_id:
+                raise ValidationError(f"Passenger entered wrong elevator: {passenger_id} in Elevator {elevator_id}, expected {request.elevator_id}")
+
+            passengers.add(passenger_id)
+            return
+
+        if not passengers:
+            raise ValidationError(f"Passenger exited from empty elevator: {passenger_id} from Elevator {elevator_id}")
+
+        if passenger_id not in passengers:
+            raise ValidationError(f"Passenger not in elevator during exit: {passenger_id} from Elevator {elevator_id}")
+
+        if request.to_floor != event.floor:
+            raise ValidationError(f"Passenger exited on wrong floor: {passenger_id} on Floor {self.floors[event.floor]}, expected {self.floors[request.to_floor]}")
+
+        passengers.remove(passenger_id)
+        self.received.pop(passenger_id, None)
+        self.completed.add(passenger_id)
+
+    def validate_receive(self, event):
+        passenger_id = event.passenger_id
+        if passenger_id not in self.passenger_requests:
+            raise ValidationError(f"Unknown passenger: {passenger_id}")
+        if passenger_id in self.completed:
+            raise ValidationError(f"Passenger received after arriving: {passenger_id} by Elevator {event.elevator_id}")
+        received_by = self.received.get(passenger_id)
+        if received_by is not None and received_by != event.elevator_id:
+            raise ValidationError(f"Passenger received twice: {passenger_id} by Elevator {event.elevator_id}, "
+                                  f"already by Elevator {received_by}")
+        self.received[passenger_id] = event.elevator_id
+
+    def validate_elevator_capacity(self, event):
+        passengers = self.elevator(event.elevator_id).passengers
+        if len(passengers) > self.capacities[event.elevator_id]:
+            raise ValidationError(f"Elevator capacity exceeded: Elevator {event.elevator_id} has {len(passengers)} passengers")
+
+    def validate_initial_state(self, event):
         # Although the output doesn't explicitly show the initial state,
         # we need to ensure the first action is compatible with the initial state:
-        # All elevators are at F1, doors closed, and no passengers inside.
-        if not self.output_events:
-            return  # No events to validate
-
-        first_event = self.output_events[0]
-        parts = first_event.split('-')
-        event_type = parts[0].split(']')[1]
-
-        if event_type == "OPEN":
-            floor = parts[1]
-            elevator_id = int(parts[2])
-            if floor != "F1":
-                raise ValidationError(f"First action OPEN is on wrong floor: Elevator {elevator_id} on Floor {floor}, expected F1")
-        elif event_type == "ARRIVE":
-            floor = parts[1]
-            elevator_id = int(parts[2])
-            if floor != "F2" and floor != "B1":
-                raise ValidationError(f"First action ARRIVE is on wrong floor: Elevator {elevator_id} on Floor {floor}, expected F2/B1")
-        elif event_type == "IN":
+        # All elevators are at the initial floor, doors closed, and no passengers inside.
+        initial = self.ruleset.initial_floor
+        floor = self.floors[event.floor] if event.floor >= 0 else None
+        if event.type == OPEN or event.type == CLOSE:
+            if event.floor != initial:
+                raise ValidationError(f"First action {EVENT_NAMES[event.type]} is on wrong floor: Elevator {event.elevator_id} "
+                                      f"on Floor {floor}, expected {self.floors[initial]}")
+        elif event.type == ARRIVE:
+            if abs(event.floor - initial) != 1:
+                expected = "/".join(self.floors[f] for f in (initial + 1, initial - 1) if 0 <= f < len(self.floors))
+                raise ValidationError(f"First action ARRIVE is on wrong floor: Elevator {event.elevator_id} on Floor {floor}, expected {expected}")
+        elif event.type == IN:
             raise ValidationError(f"First action cannot be IN")
-        elif event_type == "OUT":
+        elif event.type == OUT:
             raise ValidationError(f"First action cannot be OUT")
-        elif event_type == "CLOSE":
-            floor = parts[1]
-            elevator_id = int(parts[2])
-            if floor != "F1":
-                raise ValidationError(f"First action CLOSE is on wrong floor: Elevator {elevator_id} on Floor {floor}, expected F1")
 
     def validate_final_state(self):
         # - All passenger requests must be completed (OUT on their target floor)
         # - No passengers left in any elevator
         # - All elevators must be in CLOSE state
 
-        passenger_requests = {}
-        for line in self.input_requests:
-            match = re.match(r"\[(\d+\.\d)\](P\d+)-PRI-(\d+)-FROM-(B[1-4]|F[1-7])-TO-(B[1-4]|F[1-7])-BY-(\d)", line)
-            if match:
-                timestamp, passenger_id, priority, from_floor, to_floor, elevator_id = match.groups()
-                passenger_requests[passenger_id] = {
-                    "from_floor": from_floor,
-                    "to_floor": to_floor,
-                    "elevator_id": int(elevator_id),
-                    "completed": False,
-                }
-
-        elevator_passengers = {}
-        for i in range(1, 7):
-            elevator_passengers[i] = []
-
-        for line in self.output_events:
-            parts = line.split('-')
-            event_type = parts[0].split(']')[1]
-
-            if event_type == "IN":
-                passenger_id = parts[1]
-                elevator_id = int(parts[3])
-                elevator_passengers[elevator_id].append(passenger_id)
-            elif event_type == "OUT":
-                passenger_id = parts[1]
-                floor = parts[2]
-                elevator_id = int(parts[3])
-                elevator_passengers[elevator_id].remove(passenger_id)
-                if passenger_requests.get(passenger_id):
-                    if passenger_requests[passenger_id]["to_floor"] == floor:
-                        passenger_requests[passenger_id]["completed"] = True
-
         # Check if all requests are completed
-        for passenger_id, request in passenger_requests.items():
-            if not request["completed"]:
+        for passenger_id in self.passenger_requests:
+            if passenger_id not in self.completed:
                 raise ValidationError(f"Passenger request not completed: {passenger_id}")
 
         # Check if any passengers are left in elevators
-        for elevator_id, passengers in elevator_passengers.items():
-            if passengers:
-                raise ValidationError(f"Passengers left in elevator {elevator_id}: {passengers}")
+        for elevator_id, state in sorted(self.elevators.items()):
+            if state.passengers:
+                raise ValidationError(f"Passengers left in elevator {elevator_id}: {sorted(state.passengers)}")
 
         # Check if the last action is CLOSE
-        if self.output_events:
-            last_event = self.output_events[-1]
-            parts = last_event.split('-')
-            event_type = parts[0].split(']')[1]
-            if event_type != "CLOSE":
-                raise ValidationError("Last action must be CLOSE")
+        if self.last_event is not None and self.last_event.type != CLOSE:
+            raise ValidationError("Last action must be CLOSE")
 
     def validate(self):
+        """Run every check, raising ValidationError on the first violation."""
+        self.load_requests()
         try:
-            self.load_data()
-            self.validate_input_format()
-            self.validate_output_format()
-            self.validate_timestamps()
-            self.validate_floor_and_elevator_ids()
-            self.validate_elevator_movement()
-            self.validate_door_operation()
-            self.validate_passenger_in_out()
-            self.validate_elevator_capacity()
-            self.validate_initial_state()
-            self.validate_final_state()
-            print("Accepted")
-
-        except ValidationError as e:
-            print(f"Validation Error: {e}")
-            exit(1)
-        except Exception as e:
-            print(f"An unexpected error occurred: {e}")
-            exit(1)
+            with open_stream(self.output_file) as f_out:
+                for line in f_out:
+                    self.feed(line)
+        except FileNotFoundError as e:
+            raise ValidationError(f"File not found: {e}")
+        self.validate_final_state()
+
+
+def run_judge(input_file, output_file, ruleset_file=None, profile=False):
+    """
+    Validates one output as main() does, without raising. Returns (verdict,
+    error, stats): verdict is Accepted, Wrong Answer or Judge Error, and
+    stats the per-check timings and counters when profiling, else None.
+    """
+    try:
+        ruleset = load_ruleset(ruleset_file) if ruleset_file else None
+        validator = ElevatorValidator(input_file, output_file, ruleset)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        return "Judge Error", f"invalid rule set: {e}", None
+    validator_profile = validator.enable_profiling() if profile else None
+    verdict, error = "Accepted", ""
+    start = time.perf_counter()
+    try:
+        validator.validate()
+    except ValidationError as e:
+        verdict, error = "Wrong Answer", str(e)
+    except Exception as e:
+        verdict, error = "Judge Error", str(e)
+
+    stats = None
+    if validator_profile is not None:
+        stats = {"verdict": verdict, "error": error, "events": validator.events_processed,
+                 "wall_seconds": time.perf_counter() - start}
+        stats.update(validator_profile.to_dict())
+    return verdict, error, stats
 
 
 def main():
     parser = argparse.ArgumentParser(description="Validate elevator simulation output.")
-    parser.add_argument("--input_file", default="/root/OO_unit2/input.txt", help="Path to the input file (generated by gen.py).")
-    parser.add_argument("--output_file", default="/root/OO_unit2/output.txt", help="Path to the output file (from the elevator simulation).")
+    parser.add_argument("--input_file", default="/root/OO_unit2/input.txt", help="Path to the input file (generated by gen.py), or - for stdin.")
+    parser.add_argument("--output_file", default="/root/OO_unit2/output.txt", help="Path to the output file (from the elevator simulation), or - for stdin.")
+    parser.add_argument("--ruleset", default=None, help="JSON rule set file (default: the rules of ruleset.DEFAULT_RULESET).")
+    parser.add_argument("--profile", action="store_true", help="Print per-check timings and counters as JSON to stderr.")
+    parser.add_argument("--stats_json", "--stats-json", default=None, help="Write per-check timings and counters as JSON to this file.")
 
     args = parser.parse_args()
 
-    validator = ElevatorValidator(args.input_file, args.output_file)
-    validator.validate()
+    verdict, error, stats = run_judge(args.input_file, args.output_file, args.ruleset,
+                                      profile=args.profile or bool(args.stats_json))
+    if verdict == "Accepted":
+        print("Accepted")
+    elif verdict == "Wrong Answer":
+        print(f"Validation Error: {error}")
+    else:
+        print(f"An unexpected error occurred: {error}")
+
+    if stats is not None:
+        if args.stats_json:
+            with open(args.stats_json, "w") as f:
+                json.dump(stats, f, indent=2)
+        if args.profile:
+            print(json.dumps(stats, indent=2), file=sys.stderr)
+    if verdict != "Accepted":
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,74 @@
+import os
+import sys
+import json
+import socket
+import argparse
+
+# Kept free of the judge's own imports so that startup stays cheap.
+DEFAULT_SOCKET = os.environ.get("ELEVATOR_JUDGE_SOCKET", "/tmp/elevator_judge.sock")
+
+
+def request(socket_path, job):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall((json.dumps(job) + "\n").encode())
+        with sock.makefile("rb") as f:
+            return json.loads(f.readline())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate elevator simulation output through a running daemon.py.")
+    parser.add_argument("--input_file", default="/root/OO_unit2/input.txt", help="Path to the input file (generated by gen.py).")
+    parser.add_argument("--output_file", default="/root/OO_unit2/output.txt", help="Path to the output file (from the elevator simulation).")
+    parser.add_argument("--ruleset", default=None, help="JSON rule set file (default: the rules of ruleset.DEFAULT_RULESET).")
+    parser.add_argument("--profile", action="store_true", help="Print per-check timings and counters as JSON to stderr.")
+    parser.add_argument("--stats_json", "--stats-json", default=None, help="Write per-check timings and counters as JSON to this file.")
+    parser.add_argument("--score", action="store_true", help="Also print the score.py metrics of accepted output.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Path of the daemon's Unix domain socket.")
+
+    args = parser.parse_args()
+    # The daemon reads the files itself, so it can't see this process's stdin.
+    if args.input_file == "-" or args.output_file == "-":
+        parser.error("reading from stdin (-) needs judge.py; the daemon only reads files")
+
+    job = {"op": "judge", "input_file": os.path.abspath(args.input_file),
+           "output_file": os.path.abspath(args.output_file),
+           "ruleset": os.path.abspath(args.ruleset) if args.ruleset else None,
+           "profile": args.profile or bool(args.stats_json)}
+    try:
+        response = request(args.socket, job)
+        if response["ok"] and response["verdict"] == "Accepted" and args.score:
+            metrics = request(args.socket, dict(job, op="score"))
+            if not metrics["ok"]:
+                response = metrics
+    except OSError as e:
+        print(f"An unexpected error occurred: cannot reach judge daemon at {args.socket}: {e}")
+        sys.exit(1)
+
+    if not response["ok"]:
+        print(f"An unexpected error occurred: {response['error']}")
+        sys.exit(1)
+    if response["verdict"] == "Accepted":
+        print("Accepted")
+        if args.score:
+            print(f"Trun: {metrics['Trun']:.4f}")
+            print(f"WT: {metrics['WT']:.4f}")
+            print(f"W: {metrics['W']:.4f}")
+    elif response["verdict"] == "Wrong Answer":
+        print(f"Validation Error: {response['error']}")
+    else:
+        print(f"An unexpected error occurred: {response['error']}")
+
+    stats = response.get("stats")
+    if stats is not None:
+        if args.stats_json:
+            with open(args.stats_json, "w") as f:
+                json.dump(stats, f, indent=2)
+        if args.profile:
+            print(json.dumps(stats, indent=2), file=sys.stderr)
+    if response["verdict"] != "Accepted":
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
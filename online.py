@@ -0,0 +1,154 @@
+import os
+import sys
+import time
+import signal
+import asyncio
+import argparse
+
+from feeder import RequestFeeder, add_command_argument, format_latency, program_command
+from judge import ElevatorValidator, ValidationError
+from procstat import DEFAULT_INTERVAL, ProcessSampler, format_resources, over_budget
+
+KILL_WAIT_SECONDS = 5.0  # How long to wait for the killed program to be reaped
+
+
+class OnlineJudge:
+    """
+    Runs the program under test, feeds it the requests of an input file at
+    their timestamps and validates its stdout line by line as it arrives.
+    The process is killed on the first violation, when it runs longer than
+    `timeout` seconds, or when it stays silent for `idle_timeout` seconds
+    after its last output or the last request sent to it. CPU time, peak RSS
+    and threads of the process tree are sampled every `sample_interval`.
+    """
+
+    def __init__(self, command, input_file, output_file=None, timeout=120.0, idle_timeout=10.0, stderr=None,
+                 sample_interval=DEFAULT_INTERVAL):
+        self.command = command
+        self.input_file = input_file
+        self.output_file = output_file
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.stderr = stderr
+        self.sample_interval = sample_interval
+        self.validator = ElevatorValidator(input_file, output_file)
+        self.feeder = RequestFeeder.from_file(input_file)
+        self.last_activity = 0.0
+        self.lines = 0
+
+    async def read(self, stdout, out, start):
+        while True:
+            now = time.monotonic()
+            remaining = start + self.timeout - now
+            if remaining <= 0:
+                return "Time Limit Exceeded", f"Program ran longer than {self.timeout}s"
+            # A program waiting for its next request is not idle.
+            last_activity = max(self.last_activity, self.feeder.next_send or 0.0)
+            idle = last_activity + self.idle_timeout - now
+            if idle <= 0:
+                return "Idle Timeout", f"No output for {self.idle_timeout}s"
+            try:
+                raw = await asyncio.wait_for(stdout.readline(), min(remaining, idle))
+            except asyncio.TimeoutError:
+                continue
+            if not raw:
+                return None, ""
+            self.last_activity = time.monotonic()
+            line = raw.decode(errors="replace")
+            if out is not None:
+                out.write(line)
+            self.lines += 1
+            try:
+                self.validator.feed(line)
+            except ValidationError as e:
+                return "Wrong Answer", str(e)
+
+    async def run(self):
+        """Runs the program to completion or first failure and returns the verdict."""
+        self.validator.load_requests()
+        start = time.monotonic()
+        self.last_activity = start
+        process = await asyncio.create_subprocess_exec(
+            *self.command, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=self.stderr,
+            start_new_session=True)
+        feeder = asyncio.create_task(self.feeder.run(process.stdin, start))
+        sampler = ProcessSampler(process.pid, self.sample_interval)
+        sampling = asyncio.create_task(sampler.run())
+        out = open(self.output_file, "w") if self.output_file else None
+        try:
+            verdict, error = await self.read(process.stdout, out, start)
+            if verdict is None:
+                # stdout is closed; give the process the rest of its time to exit.
+                try:
+                    await asyncio.wait_for(process.wait(), max(0.0, start + self.timeout - time.monotonic()))
+                except asyncio.TimeoutError:
+                    verdict, error = "Time Limit Exceeded", f"Program ran longer than {self.timeout}s"
+        finally:
+            feeder.cancel()
+            sampling.cancel()
+            if out is not None:
+                out.close()
+            if process.returncode is None:
+                sampler.sample()
+            # Kill the whole process group, so that programs started through a
+            # wrapper (sh -c, a launcher script) don't leave orphans holding stdout.
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+            try:
+                await asyncio.wait_for(process.wait(), KILL_WAIT_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+        if verdict is None:
+            if process.returncode != 0:
+                verdict, error = "Runtime Error", f"Program exited with status {process.returncode}"
+            else:
+                try:
+                    self.validator.validate_final_state()
+                    verdict = "Accepted"
+                except ValidationError as e:
+                    verdict, error = "Wrong Answer", str(e)
+
+        elapsed = time.monotonic() - start
+        return {"verdict": verdict, "error": error, "lines": self.lines,
+                "elapsed": round(elapsed, 4),
+                "feed_latency": self.feeder.latency_report(),
+                "resources": sampler.report(elapsed)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run an elevator program and judge its output as it is produced.")
+    parser.add_argument("--input_file", default="/root/OO_unit2/input.txt", help="Path to the input file (generated by gen.py).")
+    parser.add_argument("--output_file", default=None, help="Optional path to save the program output to.")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Wall-clock limit for the whole run in seconds.")
+    parser.add_argument("--idle_timeout", type=float, default=10.0, help="Kill the program after this many seconds without output or input.")
+    parser.add_argument("--feed_stats", action="store_true", help="Print feed latency percentiles to stderr.")
+    parser.add_argument("--resource_stats", action="store_true", help="Print CPU time, peak RSS and threads to stderr.")
+    parser.add_argument("--cpu_budget", type=float, default=None, help="Flag runs using more CPU seconds (user + sys) than this.")
+    parser.add_argument("--cpu_util_budget", type=float, default=None, help="Flag runs using more CPU seconds per wall-clock second than this.")
+    parser.add_argument("--sample_interval", type=float, default=DEFAULT_INTERVAL, help="Seconds between resource samples.")
+    add_command_argument(parser)
+
+    args = parser.parse_args()
+    command = program_command(parser, args)
+
+    result = asyncio.run(OnlineJudge(command, args.input_file, args.output_file,
+                                     args.timeout, args.idle_timeout,
+                                     sample_interval=args.sample_interval).run())
+    if args.feed_stats:
+        print(format_latency(result["feed_latency"]), file=sys.stderr)
+    if args.resource_stats:
+        print(format_resources(result["resources"]), file=sys.stderr)
+    for reason in over_budget(result["resources"], args.cpu_budget, args.cpu_util_budget):
+        print(f"Over CPU budget: {reason}", file=sys.stderr)
+    if result["verdict"] == "Accepted":
+        print("Accepted")
+    else:
+        print(f"{result['verdict']}: {result['error']}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
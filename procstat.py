@@ -0,0 +1,117 @@
+import os
+import asyncio
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+DEFAULT_INTERVAL = 0.05  # Seconds between samples
+
+
+def read_stat(pid):
+    """(user, sys) CPU seconds of a process itself, without its children."""
+    with open(f"/proc/{pid}/stat", "r") as f:
+        # The command name may contain spaces; the fixed fields follow its ')'
+        fields = f.read().rsplit(")", 1)[1].split()
+    utime, stime = (int(x) for x in fields[11:13])
+    return utime / CLOCK_TICKS, stime / CLOCK_TICKS
+
+
+def read_status(pid):
+    """(peak RSS in kB, thread count) of a process."""
+    peak_rss = threads = 0
+    with open(f"/proc/{pid}/status", "r") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                peak_rss = int(line.split()[1])
+            elif line.startswith("Threads:"):
+                threads = int(line.split()[1])
+    return peak_rss, threads
+
+
+def descendants(pid):
+    """pid and every live process below it, read from /proc/<pid>/task/*/children."""
+    found = [pid]
+    for parent in found:
+        try:
+            tasks = os.listdir(f"/proc/{parent}/task")
+        except OSError:
+            continue
+        for tid in tasks:
+            try:
+                with open(f"/proc/{parent}/task/{tid}/children", "r") as f:
+                    found.extend(int(child) for child in f.read().split())
+            except OSError:
+                pass
+    return found
+
+
+class ProcessSampler:
+    """
+    Samples CPU user/sys time, peak RSS and thread count of a process tree
+    from /proc every `interval` seconds.
+
+    CPU time is the sum over every process seen of its own time at its last
+    sample, so a child reaped by a wrapper is not counted again in the
+    wrapper; each process may miss up to one interval of its life. Peak RSS
+    and threads are the largest tree-wide sums seen in one sample. On
+    systems without /proc every figure stays None.
+    """
+
+    def __init__(self, pid, interval=DEFAULT_INTERVAL):
+        self.pid = pid
+        self.interval = interval
+        self.cpu = {}  # pid -> (user, sys) at its last sample
+        self.peak_rss = None
+        self.max_threads = None
+        self.samples = 0
+
+    def sample(self):
+        rss_total = threads_total = 0
+        seen = False
+        for pid in descendants(self.pid):
+            try:
+                self.cpu[pid] = read_stat(pid)
+                peak_rss, threads = read_status(pid)
+            except (OSError, ValueError, IndexError):
+                continue  # Exited between listing and reading
+            seen = True
+            rss_total += peak_rss
+            threads_total += threads
+        if seen:
+            self.samples += 1
+            self.peak_rss = max(self.peak_rss or 0, rss_total)
+            self.max_threads = max(self.max_threads or 0, threads_total)
+
+    async def run(self):
+        """Samples until cancelled."""
+        while True:
+            self.sample()
+            await asyncio.sleep(self.interval)
+
+    def report(self, elapsed=None):
+        user = sum(u for u, _ in self.cpu.values()) if self.cpu else None
+        system = sum(s for _, s in self.cpu.values()) if self.cpu else None
+        total = user + system if self.cpu else None
+        return {"cpu_user": None if user is None else round(user, 3),
+                "cpu_sys": None if system is None else round(system, 3),
+                "cpu_total": None if total is None else round(total, 3),
+                "cpu_util": round(total / elapsed, 3) if total is not None and elapsed else None,
+                "peak_rss_mb": None if self.peak_rss is None else round(self.peak_rss / 1024, 1),
+                "max_threads": self.max_threads,
+                "samples": self.samples}
+
+
+def over_budget(resources, cpu_budget=None, cpu_util_budget=None):
+    """Reasons a run broke its CPU budgets: total CPU seconds, or CPU seconds per wall-clock second."""
+    reasons = []
+    if cpu_budget is not None and resources.get("cpu_total") is not None and resources["cpu_total"] > cpu_budget:
+        reasons.append(f"CPU time {resources['cpu_total']:.2f}s > {cpu_budget}s")
+    if cpu_util_budget is not None and resources.get("cpu_util") is not None and resources["cpu_util"] > cpu_util_budget:
+        reasons.append(f"CPU utilization {resources['cpu_util']:.2f} > {cpu_util_budget}")
+    return reasons
+
+
+def format_resources(resources):
+    if resources.get("cpu_total") is None:
+        return "resources: not available"
+    return (f"CPU user {resources['cpu_user']:.2f}s sys {resources['cpu_sys']:.2f}s "
+            f"(utilization {resources['cpu_util'] or 0:.2f}), peak RSS {resources['peak_rss_mb']:.1f} MB, "
+            f"threads {resources['max_threads']}")
@@ -0,0 +1,79 @@
+import json
+
+from events import FLOORS, TICKS_PER_SECOND, DEFAULT_EVENTS, EventGrammar
+
+# Declarative rule set of judge.py. A JSON rule set file holds the same keys;
+# missing keys fall back to these defaults. Elevators are IDs, or objects
+# with "id" and optional "capacity" and "speed" (seconds per floor). Every
+# event lists its field kinds (see events.FIELD_PATTERNS) and the names of
+# the ElevatorValidator checks run for it after common_checks.
+DEFAULT_RULESET = {
+    "name": "default",
+    "floors": FLOORS,
+    "initial_floor": "F1",
+    "elevators": [1, 2, 3, 4, 5, 6],
+    "capacity": 6,
+    "speed": 0.4,
+    "door_seconds": 0.4,
+    "tolerance_seconds": 0.001,
+    "common_checks": ["validate_timestamps", "validate_floor_and_elevator_ids"],
+    "events": {
+        "ARRIVE": {"fields": DEFAULT_EVENTS["ARRIVE"], "checks": ["validate_elevator_movement"]},
+        "OPEN": {"fields": DEFAULT_EVENTS["OPEN"], "checks": ["validate_door_operation"]},
+        "CLOSE": {"fields": DEFAULT_EVENTS["CLOSE"], "checks": ["validate_door_operation", "validate_elevator_movement"]},
+        "IN": {"fields": DEFAULT_EVENTS["IN"], "checks": ["validate_passenger_in_out", "validate_elevator_capacity"]},
+        "OUT": {"fields": DEFAULT_EVENTS["OUT"], "checks": ["validate_passenger_in_out"]},
+    },
+}
+
+
+def to_ticks(seconds):
+    return round(seconds * TICKS_PER_SECOND)
+
+
+class Ruleset:
+    """A rule set config resolved into the tables the validator reads."""
+
+    def __init__(self, config=None):
+        config = dict(DEFAULT_RULESET, **(config or {}))
+        self.name = config["name"]
+        self.grammar = EventGrammar({name: spec["fields"] for name, spec in config["events"].items()},
+                                    config["floors"])
+        if config["initial_floor"] not in self.grammar.floor_index:
+            raise ValueError(f"Unknown initial floor: {config['initial_floor']}")
+        self.initial_floor = self.grammar.floor_index[config["initial_floor"]]
+
+        self.capacities = {}  # elevator_id -> passengers
+        self.move_ticks = {}  # elevator_id -> ticks per floor
+        for elevator in config["elevators"]:
+            if not isinstance(elevator, dict):
+                elevator = {"id": elevator}
+            self.capacities[elevator["id"]] = elevator.get("capacity", config["capacity"])
+            self.move_ticks[elevator["id"]] = to_ticks(elevator.get("speed", config["speed"]))
+        self.door_ticks = to_ticks(config["door_seconds"])
+        self.tolerance_ticks = to_ticks(config["tolerance_seconds"])
+
+        self.checks = [()] * len(self.grammar.names)  # Event type code -> check names
+        for name, spec in config["events"].items():
+            self.checks[self.grammar.codes[name]] = tuple(config["common_checks"]) + tuple(spec.get("checks", ()))
+
+    def compile(self, validator):
+        """The dispatch table of validator: a tuple of bound checks per event type code."""
+        table = []
+        for names in self.checks:
+            handlers = []
+            for name in names:
+                handler = getattr(validator, name, None)
+                if not name.startswith("validate_") or handler is None:
+                    raise ValueError(f"Unknown check in rule set {self.name}: {name}")
+                handlers.append(handler)
+            table.append(tuple(handlers))
+        return table
+
+
+def load_ruleset(path):
+    with open(path, "r") as f:
+        return Ruleset(json.load(f))
+
+
+DEFAULT_RULES = Ruleset()  # DEFAULT_RULESET resolved, for tools that follow the default rules
@@ -1,71 +1,53 @@
-import re
+import argparse
 
-def calculate_performance_score(input_file="input.txt", output_file="output.txt"):
+from events import TICKS_PER_SECOND, ARRIVE, OPEN, CLOSE, OUT, read_events, read_requests
+from stats import summarize
+
+METRICS_VERSION = "1"  # Bump whenever a metric changes, to invalidate cached scores
+
+# Priority bands for the per-priority breakdown (gen.py emits PRI-1 .. PRI-100)
+PRIORITY_BANDS = [(1, 20), (21, 40), (41, 60), (61, 80), (81, 100)]
+
+def score_events(requests, events):
     """
-    Calculates the performance score based on the given input and output files.
+    Calculates the performance metrics of parsed requests and output events.
+    Returns a dict with Trun, the priority-weighted WT, W, percentiles of the
+    per-passenger completion times and a per-priority-band breakdown.
     """
 
-    # 1. Parse input.txt
+    # 1. Collect request times and priorities
     passenger_requests = {}
-    with open(input_file, "r") as f:
-        for line in f:
-            match = re.match(r"\[(\d+\.\d+)\](\d+)-PRI-\d+-FROM-\w+-TO-\w+-BY-\d+", line)
-            if match:
-                timestamp = float(match.group(1))
-                passenger_id = int(match.group(2))
-                passenger_requests[passenger_id] = timestamp
-
-    # 2. Parse output.txt
+    for request in requests:
+        passenger_requests[request.passenger_id] = request
+
+    # 2. Scan the output
     final_timestamp = 0
-    arrive_count = 0
-    open_count = 0
-    close_count = 0
+    counts = [0] * 5
     passenger_arrival_times = {}
-    with open(output_file, "r") as f:
-        for line in f:
-            match_arrive = re.match(r"\[\s*(\d+\.\d+)\]ARRIVE-\w+-\d+", line)
-            if match_arrive:
-                arrive_count += 1
-                final_timestamp = max(final_timestamp, float(match_arrive.group(1)))
-                continue
-
-            match_open = re.match(r"\[\s*(\d+\.\d+)\]OPEN-\w+-\d+", line)
-            if match_open:
-                open_count += 1
-                final_timestamp = max(final_timestamp, float(match_open.group(1)))
-                continue
-
-            match_close = re.match(r"\[\s*(\d+\.\d+)\]CLOSE-\w+-\d+", line)
-            if match_close:
-                close_count += 1
-                final_timestamp = max(final_timestamp, float(match_close.group(1)))
-                continue
-
-            match_in = re.match(r"\[\s*(\d+\.\d+)\]IN-(\d+)-\w+-\d+", line)
-            if match_in:
-                final_timestamp = max(final_timestamp, float(match_in.group(1)))
-                continue
-
-            match_out = re.match(r"\[\s*(\d+\.\d+)\]OUT-(\d+)-\w+-\d+", line)
-            if match_out:
-                timestamp = float(match_out.group(1))
-                passenger_id = int(match_out.group(2))
-                passenger_arrival_times[passenger_id] = timestamp
-                final_timestamp = max(final_timestamp, timestamp)
-                continue
+    for event in events:
+        counts[event.type] += 1
+        final_timestamp = max(final_timestamp, event.timestamp)
+        if event.type == OUT:
+            passenger_arrival_times[event.passenger_id] = event.timestamp
 
     # 3. Calculate Trun
-    trun = final_timestamp
+    trun = final_timestamp / TICKS_PER_SECOND
 
-    # 4. Calculate WT
+    # 4. Calculate WT, weighting each completion time by the passenger's priority
     weighted_time_sum = 0
     total_weight = 0
-    for passenger_id, request_time in passenger_requests.items():
+    completion_times = []
+    band_times = {band: [] for band in PRIORITY_BANDS}
+    for passenger_id, request in passenger_requests.items():
         if passenger_id in passenger_arrival_times:
-            arrival_time = passenger_arrival_times[passenger_id]
-            completion_time = arrival_time - request_time
-            weighted_time_sum += completion_time * 1  # Assuming weight = 1
-            total_weight += 1
+            completion_time = (passenger_arrival_times[passenger_id] - request.timestamp) / TICKS_PER_SECOND
+            weighted_time_sum += completion_time * request.priority
+            total_weight += request.priority
+            completion_times.append(completion_time)
+            for band in PRIORITY_BANDS:
+                if band[0] <= request.priority <= band[1]:
+                    band_times[band].append(completion_time)
+                    break
 
     wt = weighted_time_sum / total_weight if total_weight > 0 else 0
 
@@ -73,12 +55,43 @@ def calculate_performance_score(input_file="input.txt", output_file="output.txt"
     w_arrive = 0.4
     w_open = 0.1
     w_close = 0.1
-    w = w_open * open_count + w_close * close_count + w_arrive * arrive_count
+    w = w_open * counts[OPEN] + w_close * counts[CLOSE] + w_arrive * counts[ARRIVE]
+
+    completion = summarize(completion_times)
+    bands = {}
+    for (low, high), times in band_times.items():
+        s = summarize(times)
+        bands[f"{low}-{high}"] = {"count": s["count"], "mean": s["mean"], "p95": s["p95"], "max": s["max"]}
+
+    return {"Trun": trun, "WT": wt, "W": w,
+            "T_p50": completion["p50"], "T_p95": completion["p95"],
+            "T_p99": completion["p99"], "T_max": completion["max"],
+            "bands": bands}
+
+def calculate_performance_score(input_file="input.txt", output_file="output.txt"):
+    """
+    Calculates the performance score based on the given input and output files.
+    Returns the metrics dict of score_events().
+    """
+    with open(input_file, "r") as f_in, open(output_file, "r") as f_out:
+        return score_events(read_requests(f_in, skip_invalid=True), read_events(f_out, skip_invalid=True))
+
+def main():
+    parser = argparse.ArgumentParser(description="Score elevator simulation output.")
+    parser.add_argument("--input_file", default="input.txt", help="Path to the input file (generated by gen.py).")
+    parser.add_argument("--output_file", default="output.txt", help="Path to the output file (from the elevator simulation).")
+    args = parser.parse_args()
 
-    # 6. Print the raw metrics
-    print(f"Trun: {trun:.4f}")
-    print(f"WT: {wt:.4f}")
-    print(f"W: {w:.4f}")
+    # Print the raw metrics
+    metrics = calculate_performance_score(args.input_file, args.output_file)
+    print(f"Trun: {metrics['Trun']:.4f}")
+    print(f"WT: {metrics['WT']:.4f}")
+    print(f"W: {metrics['W']:.4f}")
+    print(f"Completion time p50/p95/p99/max: {metrics['T_p50']:.4f} / {metrics['T_p95']:.4f} / "
+          f"{metrics['T_p99']:.4f} / {metrics['T_max']:.4f}")
+    for band, s in metrics["bands"].items():
+        if s["count"]:
+            print(f"  PRI {band:>6}: {s['count']:4d} passengers, mean {s['mean']:.4f}, p95 {s['p95']:.4f}, max {s['max']:.4f}")
 
 if __name__ == "__main__":
-    calculate_performance_score()
+    main()
@@ -0,0 +1,206 @@
+import os
+import sys
+import mmap
+import argparse
+import multiprocessing
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from events import CLOSE, Event, ParseError, format_timestamp, parse_event
+from judge import ElevatorValidator, ValidationError
+
+# Checks that need the whole stream; everything else is per elevator.
+GLOBAL_CHECKS = {"validate_timestamps", "validate_floor_and_elevator_ids"}
+
+_validator = None  # Set before the pool forks so workers share the loaded requests
+
+
+def split_ranges(path, parts):
+    """Splits a file into at most `parts` byte ranges that start and end at line boundaries."""
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    bounds = [0]
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for i in range(1, parts):
+            newline = mm.find(b"\n", max(size * i // parts - 1, bounds[-1]))
+            start = newline + 1 if newline != -1 else size
+            if bounds[-1] < start < size:
+                bounds.append(start)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def scan_chunk(path, start, end):
+    """
+    Lexes the lines of one byte range, checks timestamp order and elevator IDs
+    inside it, and buckets the events per elevator as packed arrays of
+    (line, timestamp, type, floor, passenger). Lines are numbered from 0
+    within the chunk; the first error stops the scan.
+    """
+    elevator_ids = _validator.elevator_ids
+    buckets = {}
+    result = {"lines": 0, "first": None, "last_type": None, "first_timestamp": None,
+              "last_timestamp": None, "error": None, "buckets": buckets}
+    last_timestamp = -1
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        mm.seek(start)
+        index = -1
+        while mm.tell() < end:
+            raw = mm.readline()
+            index += 1
+            line = raw.decode(errors="replace").strip()
+            if not line:
+                continue
+            try:
+                event = parse_event(line)
+            except ParseError as e:
+                result["error"] = (index, str(e))
+            else:
+                if event.timestamp < last_timestamp:
+                    result["error"] = (index, f"Timestamp is not monotonically increasing: "
+                                              f"{format_timestamp(event.timestamp)} < {format_timestamp(last_timestamp)}")
+                elif event.elevator_id not in elevator_ids:
+                    result["error"] = (index, f"Invalid elevator ID: {event.elevator_id}")
+            if result["error"] is not None:
+                # Later chunks still need this chunk's line count
+                index += mm[mm.tell():end].count(b"\n")
+                break
+            last_timestamp = event.timestamp
+            if result["first"] is None:
+                result["first"] = (index, event.timestamp, event.type, event.floor, event.elevator_id, event.passenger_id)
+                result["first_timestamp"] = event.timestamp
+            result["last_type"] = event.type
+            result["last_timestamp"] = event.timestamp
+
+            bucket = buckets.get(event.elevator_id)
+            if bucket is None:
+                bucket = buckets[event.elevator_id] = (array("q"), array("q"), array("b"), array("b"), array("q"))
+            bucket[0].append(index)
+            bucket[1].append(event.timestamp)
+            bucket[2].append(event.type)
+            bucket[3].append(event.floor)
+            bucket[4].append(event.passenger_id)
+        result["lines"] = index + 1
+    return result
+
+
+def check_elevator(elevator_id, lines, timestamps, types, floors, passengers):
+    """Runs the per-elevator rules over one elevator's events in file order."""
+    validator = ElevatorValidator(_validator.input_file, None)
+    validator.passenger_requests = _validator.passenger_requests
+    handlers = [tuple(h for h in hs if h.__name__ not in GLOBAL_CHECKS) for hs in validator.handlers]
+    for i in range(len(lines)):
+        event = Event(timestamps[i], types[i], floors[i], elevator_id, passengers[i])
+        try:
+            for handler in handlers[event.type]:
+                handler(event)
+        except ValidationError as e:
+            return {"error": (lines[i], str(e)), "completed": array("q"), "left": []}
+    state = validator.elevators.get(elevator_id)
+    return {"error": None, "completed": array("q", validator.completed),
+            "left": sorted(state.passengers) if state else []}
+
+
+def fail(line, message):
+    error = ValidationError(message)
+    error.line = line
+    raise error
+
+
+def validate_sharded(input_file, output_file, workers=None):
+    """
+    Validates like ElevatorValidator.validate(), split across processes:
+    byte ranges of the memory-mapped output are lexed in parallel, then each
+    elevator's events are checked in parallel, and the global checks run in
+    the merge. Raises ValidationError for the earliest offending line, with
+    its 1-based number in the `line` attribute (None for end-of-file checks).
+    """
+    global _validator
+    workers = workers or os.cpu_count() or 1
+    _validator = ElevatorValidator(input_file, output_file)
+    _validator.load_requests()
+    if not os.path.exists(output_file):
+        raise ValidationError(f"File not found: {output_file}")
+
+    errors = []
+    context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        ranges = split_ranges(output_file, workers * 2)
+        chunks = list(executor.map(scan_chunk, [output_file] * len(ranges),
+                                   [r[0] for r in ranges], [r[1] for r in ranges]))
+
+        # Merge the chunk results: global line numbers, order across chunk boundaries
+        offset = 0
+        last_timestamp = None
+        merged = {}
+        first = None
+        last_type = None
+        for chunk in chunks:
+            if chunk["error"] is not None:
+                errors.append((offset + chunk["error"][0] + 1, chunk["error"][1]))
+            if chunk["first"] is not None:
+                if first is None:
+                    first = (offset + chunk["first"][0] + 1,) + chunk["first"][1:]
+                if last_timestamp is not None and chunk["first_timestamp"] < last_timestamp:
+                    errors.append((offset + chunk["first"][0] + 1, f"Timestamp is not monotonically increasing: "
+                                   f"{format_timestamp(chunk['first_timestamp'])} < {format_timestamp(last_timestamp)}"))
+                last_timestamp = chunk["last_timestamp"]
+                last_type = chunk["last_type"]
+            for elevator_id, bucket in chunk["buckets"].items():
+                target = merged.get(elevator_id)
+                if target is None:
+                    target = merged[elevator_id] = (array("q"), array("q"), array("b"), array("b"), array("q"))
+                target[0].extend(line + offset + 1 for line in bucket[0])
+                for column in range(1, 5):
+                    target[column].extend(bucket[column])
+            offset += chunk["lines"]
+
+        elevator_ids = sorted(merged)
+        results = dict(zip(elevator_ids, executor.map(check_elevator, elevator_ids,
+                                                      *zip(*(merged[e] for e in elevator_ids)))))
+
+    if first is not None:
+        try:
+            _validator.validate_initial_state(Event(*first[1:]))
+        except ValidationError as e:
+            errors.append((first[0], str(e)))
+    errors.extend(result["error"] for result in results.values() if result["error"] is not None)
+    if errors:
+        fail(*min(errors))
+
+    completed = set()
+    for result in results.values():
+        completed.update(result["completed"])
+    for passenger_id in _validator.passenger_requests:
+        if passenger_id not in completed:
+            fail(None, f"Passenger request not completed: {passenger_id}")
+    for elevator_id in elevator_ids:
+        if results[elevator_id]["left"]:
+            fail(None, f"Passengers left in elevator {elevator_id}: {results[elevator_id]['left']}")
+    if last_type is not None and last_type != CLOSE:
+        fail(None, "Last action must be CLOSE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate elevator simulation output, sharded by elevator across cores.")
+    parser.add_argument("--input_file", default="/root/OO_unit2/input.txt", help="Path to the input file (generated by gen.py).")
+    parser.add_argument("--output_file", default="/root/OO_unit2/output.txt", help="Path to the output file (from the elevator simulation).")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: CPU count).")
+
+    args = parser.parse_args()
+
+    try:
+        validate_sharded(args.input_file, args.output_file, args.workers)
+        print("Accepted")
+    except ValidationError as e:
+        line = getattr(e, "line", None)
+        print(f"Validation Error: {e}" + (f" (line {line})" if line else ""))
+        sys.exit(1)
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import os
+import sys
+import json
+import heapq
+import hashlib
+import argparse
+
+from events import ARRIVE, OPEN, CLOSE, IN, OUT, Event, format_event, read_requests
+from ruleset import DEFAULT_RULES
+from score import score_events
+
+SIMULATOR_VERSION = "1"  # Bump when the scheduler changes, to invalidate cached baselines
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "elevator_judge", "baselines")
+
+
+def direction_of(request):
+    return 1 if request.to_floor > request.from_floor else -1
+
+
+class SimElevator:
+    """One elevator scheduled with LOOK over the passengers assigned to it."""
+
+    def __init__(self, elevator_id, emit, rules=DEFAULT_RULES):
+        self.elevator_id = elevator_id
+        self.emit = emit
+        # Same physics judge.py enforces under the rule set
+        self.capacity = rules.capacities[elevator_id]
+        self.move_ticks = rules.move_ticks[elevator_id]
+        self.door_ticks = rules.door_ticks
+        self.floor = rules.initial_floor
+        self.direction = 0
+        self.door_open = False
+        self.busy = False  # A wake-up (arrival or door close) is pending
+        self.inside = []
+        self.waiting = {}  # floor -> [Request]
+
+    def add_request(self, request):
+        self.waiting.setdefault(request.from_floor, []).append(request)
+
+    def decide_direction(self):
+        """LOOK: keep going while there is work ahead, otherwise turn toward the remaining work."""
+        waiting_here = self.waiting.get(self.floor)
+        targets = [r.to_floor for r in self.inside]
+        targets.extend(floor for floor, requests in self.waiting.items() if requests and floor != self.floor)
+        if self.direction:
+            if any((t - self.floor) * self.direction > 0 for t in targets):
+                return self.direction
+            if waiting_here and any(direction_of(r) == self.direction for r in waiting_here):
+                return self.direction
+        if waiting_here:
+            return direction_of(waiting_here[0])
+        for t in targets:
+            if t != self.floor:
+                return 1 if t > self.floor else -1
+        return 0
+
+    def boardable(self, direction):
+        waiting_here = self.waiting.get(self.floor, [])
+        return [r for r in waiting_here if direction == 0 or direction_of(r) == direction]
+
+    def board(self, t):
+        direction = self.decide_direction()
+        for request in self.boardable(direction):
+            if len(self.inside) >= self.capacity:
+                break
+            self.waiting[self.floor].remove(request)
+            self.inside.append(request)
+            self.emit(Event(t, IN, self.floor, self.elevator_id, request.passenger_id))
+        self.direction = direction
+
+    def plan(self, t):
+        """Decides the next action with the door closed at time t; returns the wake-up time or None."""
+        leaving = [r for r in self.inside if r.to_floor == self.floor]
+        direction = self.decide_direction()
+        if leaving or (len(self.inside) - len(leaving) < self.capacity and self.boardable(direction)):
+            self.emit(Event(t, OPEN, self.floor, self.elevator_id))
+            for request in leaving:
+                self.inside.remove(request)
+                self.emit(Event(t, OUT, self.floor, self.elevator_id, request.passenger_id))
+            self.board(t)
+            self.door_open = True
+            return t + self.door_ticks
+
+        self.direction = direction
+        if direction == 0:
+            return None
+        return t + self.move_ticks
+
+    def wake(self, t):
+        if self.door_open:
+            self.board(t)
+            self.emit(Event(t, CLOSE, self.floor, self.elevator_id))
+            self.door_open = False
+        elif self.busy:
+            self.floor += self.direction
+            self.emit(Event(t, ARRIVE, self.floor, self.elevator_id))
+        return self.plan(t)
+
+
+def simulate(requests):
+    """Yields a legal event trace for the requests, in timestamp order."""
+    trace = []
+    elevators = {i: SimElevator(i, trace.append) for i in DEFAULT_RULES.capacities}
+    queue = []  # (time, kind, seq, payload); requests (kind 0) go before wake-ups at the same time
+    seq = 0
+    for request in requests:
+        heapq.heappush(queue, (request.timestamp, 0, seq, request))
+        seq += 1
+
+    while queue:
+        t, kind, _, payload = heapq.heappop(queue)
+        if kind == 0:
+            elevator = elevators[payload.elevator_id]
+            elevator.add_request(payload)
+            if elevator.busy:
+                continue
+        else:
+            elevator = payload
+        next_time = elevator.wake(t)
+        elevator.busy = next_time is not None
+        if elevator.busy:
+            heapq.heappush(queue, (next_time, 1, seq, elevator))
+            seq += 1
+        yield from trace
+        trace.clear()
+
+
+def input_hash(input_file):
+    with open(input_file, "rb") as f:
+        data = f.read()
+    return hashlib.sha256(SIMULATOR_VERSION.encode() + b"\0" + data).hexdigest()
+
+
+def baseline_metrics(input_file, cache_dir=DEFAULT_CACHE_DIR):
+    """Score of the reference scheduler on an input, cached by input hash."""
+    cache_file = os.path.join(cache_dir, input_hash(input_file) + ".json") if cache_dir else None
+    if cache_file and os.path.exists(cache_file):
+        with open(cache_file, "r") as f:
+            return json.load(f)
+
+    with open(input_file, "r") as f:
+        requests = list(read_requests(f))
+    metrics = score_events(requests, simulate(requests))
+
+    if cache_file:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(metrics, f)
+        os.replace(tmp_file, cache_file)
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate a reference LOOK scheduler on an input file.")
+    parser.add_argument("--input_file", default="/root/OO_unit2/input.txt", help="Path to the input file (generated by gen.py).")
+    parser.add_argument("--output_file", default=None, help="Optional path to write the simulated trace to (- for stdout).")
+    parser.add_argument("--cache_dir", default=DEFAULT_CACHE_DIR, help="Directory caching baseline metrics by input hash.")
+
+    args = parser.parse_args()
+
+    with open(args.input_file, "r") as f:
+        requests = list(read_requests(f))
+
+    if args.output_file:
+        out = sys.stdout if args.output_file == "-" else open(args.output_file, "w")
+        for event in simulate(requests):
+            out.write(format_event(event) + "\n")
+        if out is not sys.stdout:
+            out.close()
+        return
+
+    metrics = baseline_metrics(args.input_file, args.cache_dir)
+    print(f"Trun: {metrics['Trun']:.4f}")
+    print(f"WT: {metrics['WT']:.4f}")
+    print(f"W: {metrics['W']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
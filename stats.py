@@ -0,0 +1,41 @@
+import math
+import random
+
+
+def percentile(sorted_values, q):
+    """Linear-interpolated q-th percentile (0-100) of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return sorted_values[lower]
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(values):
+    """Count, mean, p50/p95/p99 and extremes of a list of numbers."""
+    values = sorted(values)
+    if not values:
+        return {"count": 0, "mean": 0.0, "min": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values),
+        "min": values[0],
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": values[-1],
+    }
+
+
+def bootstrap_ci(values, confidence=0.95, resamples=2000, rng=None):
+    """Mean of values and its percentile-bootstrap confidence interval as (mean, low, high)."""
+    if not values:
+        return 0.0, 0.0, 0.0
+    rng = rng or random.Random(0)
+    n = len(values)
+    means = sorted(sum(rng.choices(values, k=n)) / n for _ in range(resamples))
+    tail = (1 - confidence) / 2 * 100
+    return sum(values) / n, percentile(means, tail), percentile(means, 100 - tail)
@@ -0,0 +1,133 @@
+import os
+import sys
+import json
+import shutil
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from gen import PROFILES, generate_requests
+from online import OnlineJudge, add_command_argument, program_command
+from procstat import over_budget
+from score import calculate_performance_score
+from stats import summarize
+
+METRICS = ["Trun", "WT", "W"]
+RESOURCE_METRICS = ["cpu_total", "cpu_util", "peak_rss_mb", "max_threads"]
+
+
+def run_requests(requests, command, timeout=120.0, idle_timeout=10.0, replay_dir=None, name="run",
+                 cpu_budget=None, cpu_util_budget=None):
+    """
+    Runs, judges and scores one list of request lines in its own temp directory.
+    A failing run keeps its input.txt/output.txt under replay_dir. Runs over a
+    CPU budget get the reasons in `over_budget`, whatever their verdict.
+    """
+    result = {"verdict": "Judge Error", "error": "", "Trun": None, "WT": None, "W": None, "over_budget": ""}
+    with tempfile.TemporaryDirectory(prefix=f"elevator_{name}_") as work_dir:
+        input_file = os.path.join(work_dir, "input.txt")
+        output_file = os.path.join(work_dir, "output.txt")
+        try:
+            with open(input_file, "w") as f:
+                for request in requests:
+                    f.write(request + "\n")
+            judge = OnlineJudge(command, input_file, output_file, timeout, idle_timeout, stderr=subprocess.DEVNULL)
+            run = asyncio.run(judge.run())
+            result["verdict"], result["error"] = run["verdict"], run["error"]
+            result.update(run["resources"])
+            result["over_budget"] = "; ".join(over_budget(run["resources"], cpu_budget, cpu_util_budget))
+            if run["verdict"] == "Accepted":
+                result.update(calculate_performance_score(input_file, output_file))
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+
+        if result["verdict"] != "Accepted" and replay_dir:
+            os.makedirs(replay_dir, exist_ok=True)
+            for path in (input_file, output_file):
+                if os.path.exists(path):
+                    shutil.copy(path, replay_dir)
+    return result
+
+
+def run_seed(seed, command, num_requests=50, time_limit=50, timeout=120.0, idle_timeout=10.0, keep_dir=None,
+             profile="uniform", cpu_budget=None, cpu_util_budget=None):
+    """
+    Generates, runs, judges and scores one seed.
+    Failing seeds keep their input.txt/output.txt under keep_dir/seed_<n>.
+    """
+    requests = generate_requests(num_requests, time_limit, seed, profile)
+    replay_dir = os.path.join(keep_dir, f"seed_{seed}") if keep_dir else None
+    result = {"seed": seed}
+    result.update(run_requests(requests, command, timeout, idle_timeout, replay_dir, str(seed),
+                               cpu_budget, cpu_util_budget))
+    return result
+
+
+def run_stress(seeds, command, workers=None, **options):
+    """Runs run_seed over all seeds in parallel, reporting failures as they happen."""
+    results = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        futures = [executor.submit(run_seed, seed, command, **options) for seed in seeds]
+        for future in as_completed(futures):
+            result = future.result()
+            if result["verdict"] != "Accepted":
+                print(f"seed {result['seed']}: {result['verdict']}: {result['error']}", flush=True)
+            results.append(result)
+    return sorted(results, key=lambda r: r["seed"])
+
+
+def print_report(results):
+    passed = [r for r in results if r["verdict"] == "Accepted"]
+    print(f"Pass rate: {len(passed)}/{len(results)} ({100 * len(passed) / len(results):.1f}%)")
+    for metric in METRICS:
+        s = summarize([r[metric] for r in passed])
+        print(f"{metric:>4}: mean {s['mean']:.4f}  min {s['min']:.4f}  p50 {s['p50']:.4f}  "
+              f"p95 {s['p95']:.4f}  max {s['max']:.4f}")
+    for metric in RESOURCE_METRICS:
+        values = [r[metric] for r in results if r.get(metric) is not None]
+        if values:
+            s = summarize(values)
+            print(f"{metric}: mean {s['mean']:.3f}  p50 {s['p50']:.3f}  p95 {s['p95']:.3f}  max {s['max']:.3f}")
+    failed = [r["seed"] for r in results if r["verdict"] != "Accepted"]
+    if failed:
+        print(f"Failing seeds: {' '.join(map(str, failed))}")
+    over = [r["seed"] for r in results if r.get("over_budget")]
+    if over:
+        print(f"Over CPU budget: {' '.join(map(str, over))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate, run, judge and score an elevator program over many seeds.")
+    parser.add_argument("--seeds", type=int, default=100, help="Number of seeds to run.")
+    parser.add_argument("--first_seed", type=int, default=0, help="First seed of the range.")
+    parser.add_argument("--num_requests", type=int, default=50, help="Requests per generated input.")
+    parser.add_argument("--time_limit", type=int, default=50, help="Limit of input time.")
+    parser.add_argument("--profile", choices=PROFILES, default="uniform", help="Workload profile of the generated inputs.")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Wall-clock limit per run in seconds.")
+    parser.add_argument("--idle_timeout", type=float, default=10.0, help="Idle limit per run in seconds.")
+    parser.add_argument("--cpu_budget", type=float, default=None, help="Flag runs using more CPU seconds (user + sys) than this.")
+    parser.add_argument("--cpu_util_budget", type=float, default=None, help="Flag runs using more CPU seconds per wall-clock second than this.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: CPU count).")
+    parser.add_argument("--keep_dir", default="failures", help="Directory to keep the input/output of failing seeds in.")
+    parser.add_argument("--summary", default=None, help="Optional JSON file with the result of every seed.")
+    add_command_argument(parser)
+
+    args = parser.parse_args()
+    command = program_command(parser, args)
+
+    seeds = range(args.first_seed, args.first_seed + args.seeds)
+    results = run_stress(seeds, command, args.workers, num_requests=args.num_requests, time_limit=args.time_limit,
+                         timeout=args.timeout, idle_timeout=args.idle_timeout, keep_dir=args.keep_dir,
+                         profile=args.profile, cpu_budget=args.cpu_budget, cpu_util_budget=args.cpu_util_budget)
+    if args.summary:
+        with open(args.summary, "w") as f:
+            json.dump(results, f, indent=2)
+    print_report(results)
+    if any(r["verdict"] != "Accepted" for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()